@@ -0,0 +1,102 @@
+"""benchmarks — timing suite for each subproject's hot path
+
+Usage:
+  python -m benchmarks                      # full size (1M todos / bookmarks)
+  python -m benchmarks --size 10000 --only todo,grid
+  python -m benchmarks --out bench.json --compare benchmarks/baseline.json
+  python -m benchmarks --size 100000 --profile prof/
+
+Results are written as JSON ({"meta": ..., "results": {name: {...}}}) so two
+runs can be compared with --compare. --profile writes one cProfile .prof file
+per benchmark (open with `python -m pstats`, snakeviz or flameprof).
+
+No external dependencies (only standard library).
+"""
+import contextlib
+import cProfile
+import io
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SIZE = 1_000_000
+REGRESSION_THRESHOLD = 0.20
+
+
+def add_path(*parts):
+    """Make a script-style subproject folder importable (bookmarks_tool, quant_demo)."""
+    path = os.path.join(ROOT, *parts)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+class Runner:
+    def __init__(self, repeat=3, profile_dir=None, quiet=False):
+        self.repeat = repeat
+        self.profile_dir = profile_dir
+        self.quiet = quiet
+        self.results = {}
+
+    def bench(self, name, fn, n, setup=None):
+        """Time fn() `repeat` times (setup() runs untimed before each) and record best/mean.
+
+        fn's stdout is discarded so print-heavy CLI functions measure work, not the terminal.
+        """
+        times = []
+        for _ in range(self.repeat):
+            if setup:
+                setup()
+            with contextlib.redirect_stdout(io.StringIO()):
+                t0 = time.perf_counter()
+                fn()
+                times.append(time.perf_counter() - t0)
+        if self.profile_dir:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            if setup:
+                setup()
+            prof = cProfile.Profile()
+            with contextlib.redirect_stdout(io.StringIO()):
+                prof.runcall(fn)
+            prof.dump_stats(os.path.join(self.profile_dir, f"{name}.prof"))
+        best = min(times)
+        self.results[name] = {
+            "n": n,
+            "best_s": round(best, 6),
+            "mean_s": round(sum(times) / len(times), 6),
+            "per_item_us": round(best / n * 1e6, 4) if n else None,
+            "repeat": self.repeat,
+        }
+        if not self.quiet:
+            print(f"{name:<32} n={n:<9} best={best:8.4f}s mean={self.results[name]['mean_s']:8.4f}s")
+
+    def report(self, size):
+        return {
+            "meta": {
+                "created": datetime.utcnow().isoformat() + "Z",
+                "size": size,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+            },
+            "results": self.results,
+        }
+
+
+def compare(current, baseline, threshold=REGRESSION_THRESHOLD):
+    """Return [(name, old_s, new_s, ratio, regressed)] for benchmarks present in both runs."""
+    rows = []
+    for name, res in current["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if not old or old.get("n") != res["n"] or not old.get("best_s"):
+            continue
+        ratio = res["best_s"] / old["best_s"]
+        rows.append((name, old["best_s"], res["best_s"], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def load_json(path):
+    with open(path, "r", encoding="utf-8") as fh:
+        return json.load(fh)
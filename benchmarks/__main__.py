@@ -0,0 +1,58 @@
+import argparse
+import json
+import sys
+
+from benchmarks import DEFAULT_SIZE, REGRESSION_THRESHOLD, Runner, compare, load_json
+
+SUITES = ("todo", "bookmarks", "grid")
+
+
+def load_suite(name):
+    # imported lazily so --only todo does not load the other subprojects
+    if name == "todo":
+        from benchmarks import bench_todo as mod
+    elif name == "bookmarks":
+        from benchmarks import bench_bookmarks as mod
+    else:
+        from benchmarks import bench_grid as mod
+    return mod
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="python -m benchmarks", description="Run funStuff hot-path benchmarks")
+    p.add_argument("--size", type=int, default=DEFAULT_SIZE, help="Items per benchmark (todos, bookmarks, grid levels)")
+    p.add_argument("--only", default=",".join(SUITES), help="Comma-separated suites: " + ",".join(SUITES))
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--out", help="Write results JSON here")
+    p.add_argument("--compare", help="Baseline results JSON to compare against")
+    p.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD, help="Allowed slowdown ratio (0.2 = 20%%)")
+    p.add_argument("--profile", metavar="DIR", help="Also dump a cProfile .prof per benchmark into DIR")
+    args = p.parse_args(argv)
+
+    names = [s.strip() for s in args.only.split(",") if s.strip()]
+    unknown = set(names) - set(SUITES)
+    if unknown:
+        p.error(f"unknown suite(s): {', '.join(sorted(unknown))}")
+
+    runner = Runner(repeat=args.repeat, profile_dir=args.profile)
+    for name in names:
+        load_suite(name).run(runner, args.size)
+    report = runner.report(args.size)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"Wrote results to {args.out}")
+
+    if args.compare:
+        rows = compare(report, load_json(args.compare), args.threshold)
+        regressed = [r for r in rows if r[4]]
+        for name, old, new, ratio, bad in rows:
+            print(f"{name:<32} {old:8.4f}s -> {new:8.4f}s  x{ratio:.2f}{'  REGRESSION' if bad else ''}")
+        if regressed:
+            print(f"{len(regressed)} benchmark(s) slower than +{args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
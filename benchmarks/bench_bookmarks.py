@@ -0,0 +1,34 @@
+"""Chrome JSON load -> dedupe -> reorganize -> write_html pipeline of tidy_bookmarks."""
+import json
+import os
+import tempfile
+
+from benchmarks import add_path
+from benchmarks.generators import make_chrome_bookmarks
+
+add_path("bookmarks_tool")
+import tidy_bookmarks  # noqa: E402
+
+
+def run(runner, size):
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "Bookmarks.json")
+        with open(src, "w", encoding="utf-8") as fh:
+            json.dump(make_chrome_bookmarks(size), fh)
+        out = os.path.join(tmp, "bookmarks-reorganized.html")
+
+        loaded = tidy_bookmarks.load_bookmarks_from_chrome_json(src)
+        deduped = tidy_bookmarks.dedupe_bookmarks(loaded)
+        buckets, others = tidy_bookmarks.reorganize(deduped)
+
+        runner.bench("bookmarks.load_chrome_json", lambda: tidy_bookmarks.load_bookmarks_from_chrome_json(src), size)
+        runner.bench("bookmarks.dedupe", lambda: tidy_bookmarks.dedupe_bookmarks(loaded), len(loaded))
+        runner.bench("bookmarks.reorganize", lambda: tidy_bookmarks.reorganize(deduped), len(deduped))
+        runner.bench("bookmarks.write_html", lambda: tidy_bookmarks.write_html(buckets, others, out), len(deduped))
+
+        def pipeline():
+            bms = tidy_bookmarks.load_bookmarks_from_chrome_json(src)
+            b, o = tidy_bookmarks.reorganize(tidy_bookmarks.dedupe_bookmarks(bms))
+            tidy_bookmarks.write_html(b, o, out)
+
+        runner.bench("bookmarks.pipeline", pipeline, size)
@@ -0,0 +1,25 @@
+"""simulate_grid over a synthetic price series (no exchange access needed)."""
+from benchmarks import add_path
+from benchmarks.generators import make_price_series
+
+add_path("quant_demo")
+import demo_grid  # noqa: E402
+
+GRID_STEPS = 5
+STEP_SIZE = 50.0
+AMOUNT = 0.001
+
+
+def run(runner, size):
+    # one grid per tick; cap ticks so the default size stays in the seconds range
+    prices = make_price_series(min(size, 200_000))
+    runner.bench(
+        "grid.simulate_grid_per_tick",
+        lambda: [demo_grid.simulate_grid(p, GRID_STEPS, STEP_SIZE, AMOUNT) for p in prices],
+        len(prices),
+    )
+    runner.bench(
+        "grid.simulate_grid_wide",
+        lambda: demo_grid.simulate_grid(prices[-1], size // 2, STEP_SIZE / 10, AMOUNT),
+        size,
+    )
@@ -0,0 +1,37 @@
+"""load_todos / save_todos / search_todos on a large synthetic list, plus load_all_lists."""
+import os
+import tempfile
+
+from benchmarks import add_path
+from benchmarks.generators import make_todos
+
+N_LISTS = 8
+
+add_path()
+import todo  # noqa: E402
+
+
+def run(runner, size):
+    todos = make_todos(size)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "todos.json")
+        runner.bench("todo.save_todos", lambda: todo.save_todos(todos, path), size)
+        runner.bench("todo.load_todos", lambda: todo.load_todos(path), size)
+        # same call without the (disabled) funmetrics wrapper, to keep its overhead visible
+        runner.bench("todo.load_todos_uninstrumented", lambda: todo.load_todos.__wrapped__(path), size)
+        runner.bench("todo.search_todos", lambda: todo.search_todos("milk", path), size)
+        runner.bench("todo.search_todos_no_match", lambda: todo.search_todos("zzz-no-match", path), size)
+
+        # the same todos split over named lists: serial parse vs. process pool
+        base = os.path.join(tmp, "all", "todos.json")
+        for i in range(N_LISTS):
+            name = f"list{i}"
+            todo.save_todos(todos[i::N_LISTS], todo.list_path(name, base), name)
+        runner.bench("todo.load_all_lists_serial", lambda: todo.load_all_lists(base, jobs=1), size)
+        threshold = todo.PARALLEL_MIN_BYTES
+        todo.PARALLEL_MIN_BYTES = 0
+        try:
+            runner.bench("todo.load_all_lists_processes",
+                         lambda: todo.load_all_lists(base, jobs=max(2, os.cpu_count() or 1)), size)
+        finally:
+            todo.PARALLEL_MIN_BYTES = threshold
@@ -0,0 +1,87 @@
+"""Synthetic data generators for the benchmarks.
+
+All generators are seeded so runs are comparable across machines and commits.
+"""
+import random
+from datetime import datetime, timedelta
+
+WORDS = ("buy milk read book call mom fix bug write report pay rent review pr "
+         "gym plan trip email boss clean desk order parts update docs").split()
+
+DOMAINS = [
+    "github.com", "gitlab.com", "udel.edu", "canvas.instructure.com", "medium.com",
+    "x.com", "substack.com", "binance.com", "coinbase.com", "bloomberg.com",
+    "news.ycombinator.com", "docs.python.org", "youtube.com", "example.org",
+]
+
+
+def make_todos(n, seed=0):
+    """n todo dicts in the shape todo.add_todo writes (about a third done)."""
+    rng = random.Random(seed)
+    base = datetime(2025, 1, 1)
+    todos = []
+    for i in range(1, n + 1):
+        created = base + timedelta(seconds=i * 37)
+        done = rng.random() < 0.33
+        todos.append({
+            "id": i,
+            "text": " ".join(rng.choices(WORDS, k=rng.randint(2, 6))),
+            "created": created.isoformat() + "Z",
+            "done": done,
+            "done_at": (created + timedelta(hours=3)).isoformat() + "Z" if done else None,
+        })
+    return todos
+
+
+def _url_node(rng, i, dup_rate):
+    # reuse an earlier id's URL for a fraction of entries so dedupe has work to do
+    j = rng.randrange(i) if i and rng.random() < dup_rate else i
+    domain = DOMAINS[j % len(DOMAINS)]
+    return {
+        "date_added": str(13384204377920990 + i),
+        "date_last_used": "0",
+        "guid": f"00000000-0000-0000-0000-{i:012d}",
+        "id": str(i + 100),
+        "meta_info": {"power_bookmark_meta": ""},
+        "name": f"Bookmark {j} on {domain}",
+        "type": "url",
+        "url": f"https://{domain}/page/{j}",
+    }
+
+
+def make_chrome_bookmarks(n, folder_size=200, dup_rate=0.1, seed=0):
+    """Chrome `Bookmarks` JSON (same shape as bookmarks_tool/backups/*.json) with n URLs.
+
+    URLs are spread over nested folders of `folder_size` entries under
+    bookmark_bar and other.
+    """
+    rng = random.Random(seed)
+    folders = []
+    for start in range(0, n, folder_size):
+        folders.append({
+            "children": [_url_node(rng, i, dup_rate) for i in range(start, min(n, start + folder_size))],
+            "date_added": "13384204377920990",
+            "guid": f"f0000000-0000-0000-0000-{start:012d}",
+            "id": str(start),
+            "name": f"Folder {start // folder_size}",
+            "type": "folder",
+        })
+    half = len(folders) // 2
+    return {
+        "checksum": "0" * 32,
+        "roots": {
+            "bookmark_bar": {"children": folders[:half], "name": "Bookmarks bar", "type": "folder"},
+            "other": {"children": folders[half:], "name": "Other bookmarks", "type": "folder"},
+            "synced": {"children": [], "name": "Mobile bookmarks", "type": "folder"},
+        },
+        "version": 1,
+    }
+
+
+def make_price_series(n, start=60000.0, vol=0.002, seed=0):
+    """Geometric random walk of n mid prices."""
+    rng = random.Random(seed)
+    prices = [start]
+    for _ in range(n - 1):
+        prices.append(prices[-1] * (1.0 + rng.gauss(0.0, vol)))
+    return prices
@@ -23,7 +23,14 @@ import sys
 import time
 from typing import Dict, List
 
+try:
+    from funmetrics import configure as configure_metrics, metrics
+except ImportError:  # run as a plain script: funmetrics.py is in the repo root
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from funmetrics import configure as configure_metrics, metrics
 
+
+@metrics.timed("bookmarks.load_bookmarks_from_chrome_json")
 def load_bookmarks_from_chrome_json(path: str) -> List[Dict[str, str]]:
     """Load a flat list of {name, url} from a Chrome Bookmarks JSON file."""
     with open(path, "r", encoding="utf-8") as f:
@@ -53,6 +60,7 @@ def load_bookmarks_from_chrome_json(path: str) -> List[Dict[str, str]]:
     return urls
 
 
+@metrics.timed("bookmarks.write_chrome_import_html")
 def write_chrome_import_html(
     bookmarks: List[Dict[str, str]],
     outpath: str,
@@ -122,7 +130,13 @@ def main() -> None:
         default="Bookmarks",
         help="HTML <TITLE>/<H1> text for the generated file.",
     )
+    parser.add_argument(
+        "--metrics",
+        metavar="PATH",
+        help="Write timings to PATH (.prom = Prometheus text, else JSON lines).",
+    )
     args = parser.parse_args()
+    configure_metrics(args.metrics)
 
     input_path = args.input
     if not os.path.exists(input_path):
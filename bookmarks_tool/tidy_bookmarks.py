@@ -17,6 +17,12 @@ from urllib.parse import urlparse
 import json
 import datetime
 
+try:
+    from funmetrics import configure as configure_metrics, metrics
+except ImportError:  # run as a plain script: funmetrics.py is in the repo root
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from funmetrics import configure as configure_metrics, metrics
+
 
 class BookmarkHTMLParser(HTMLParser):
     def __init__(self):
@@ -46,6 +52,7 @@ class BookmarkHTMLParser(HTMLParser):
             self.cur_text += data
 
 
+@metrics.timed("bookmarks.load_bookmarks_from_html")
 def load_bookmarks_from_html(path):
     with open(path,'r',encoding='utf-8') as f:
         data = f.read()
@@ -54,6 +61,7 @@ def load_bookmarks_from_html(path):
     return p.bookmarks
 
 
+@metrics.timed("bookmarks.load_bookmarks_from_chrome_json")
 def load_bookmarks_from_chrome_json(path):
     # Chrome 'Bookmarks' JSON structure: roots -> (bookmark_bar | other | synced) -> children
     with open(path,'r',encoding='utf-8') as f:
@@ -74,6 +82,7 @@ def load_bookmarks_from_chrome_json(path):
     return urls
 
 
+@metrics.timed("bookmarks.dedupe_bookmarks")
 def dedupe_bookmarks(bookmarks):
     seen = set()
     out = []
@@ -91,6 +100,7 @@ DEFAULT_ORDER = [
 ]
 
 
+@metrics.timed("bookmarks.reorganize")
 def reorganize(bookmarks, order=None):
     order = order or DEFAULT_ORDER
     buckets = {k: [] for k in order}
@@ -116,6 +126,7 @@ def reorganize(bookmarks, order=None):
     return buckets, others
 
 
+@metrics.timed("bookmarks.write_html")
 def write_html(buckets, others, outpath):
     with open(outpath,'w',encoding='utf-8') as f:
         f.write('<!doctype html>\n<html><head><meta charset="utf-8"><title>Bookmarks reorganized</title></head><body>\n')
@@ -137,7 +148,9 @@ def main():
     p.add_argument('--outdir', default='out')
     p.add_argument('--simulate', action='store_true')
     p.add_argument('--audit', action='store_true')
+    p.add_argument('--metrics', metavar='PATH', help='Write timings to PATH (.prom = Prometheus text, else JSON lines)')
     args = p.parse_args()
+    configure_metrics(args.metrics)
 
     input_path = args.input
     if not os.path.exists(input_path):
@@ -169,8 +182,10 @@ def main():
                 sys.exit(3)
 
     print(f'Loaded {len(bookmarks)} bookmarks from {input_path}')
+    metrics.incr('bookmarks.loaded', len(bookmarks))
 
     deduped = dedupe_bookmarks(bookmarks)
+    metrics.incr('bookmarks.duplicates', len(bookmarks) - len(deduped))
     print(f'Deduped -> {len(deduped)} unique bookmarks')
 
     buckets, others = reorganize(deduped)
@@ -0,0 +1,70 @@
+"""experiments/bench_vsearch.py
+
+Compare queries/sec of the in-process local index against the qmd subprocess path.
+
+Usage:
+  python experiments/bench_vsearch.py --docs 20000 --queries 200
+  python experiments/bench_vsearch.py --docs 20000 --queries 200 --ivf
+
+The qmd side is skipped when QMD_BIN is not executable. The local index is
+built in a temporary directory from synthetic documents.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from local_index import LocalIndex
+from topic_summarizer import QMD_BIN, qmd_vsearch
+
+WORDS = ("values honesty family school music travel finance code graph retrieval summary "
+         "python notes research weekend coffee project deadline budget health reading").split()
+
+
+def synthetic_docs(n, seed=0):
+    rng = random.Random(seed)
+    return {f"doc-{i}.md": " ".join(rng.choices(WORDS, k=40)) for i in range(n)}
+
+
+def qps(fn, queries):
+    t0 = time.perf_counter()
+    fn(queries)
+    dt = time.perf_counter() - t0
+    return len(queries) / dt if dt else float("inf")
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--docs", type=int, default=20000)
+    p.add_argument("--queries", type=int, default=200)
+    p.add_argument("--k", type=int, default=5)
+    p.add_argument("--ivf", action="store_true", help="Also build an IVF index and search with nprobe")
+    p.add_argument("--nprobe", type=int, default=8)
+    args = p.parse_args()
+
+    rng = random.Random(1)
+    queries = [" ".join(rng.choices(WORDS, k=3)) for _ in range(args.queries)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = LocalIndex(tmp)
+        t0 = time.perf_counter()
+        index.ingest(synthetic_docs(args.docs))
+        print(f"ingest: {args.docs} docs in {time.perf_counter() - t0:.2f}s")
+
+        print(f"local exact (one-by-one): {qps(lambda qs: [index.vsearch(q, args.k) for q in qs], queries):,.0f} q/s")
+        print(f"local exact (batched):    {qps(lambda qs: index.vsearch_batch(qs, args.k), queries):,.0f} q/s")
+        if args.ivf:
+            index.build_ivf()
+            print(f"local ivf nprobe={args.nprobe}:     "
+                  f"{qps(lambda qs: index.vsearch_batch(qs, args.k, nprobe=args.nprobe), queries):,.0f} q/s")
+
+    if os.access(QMD_BIN, os.X_OK):
+        sample = queries[: min(20, len(queries))]
+        print(f"qmd subprocess:           {qps(lambda qs: [qmd_vsearch(q, args.k) for q in qs], sample):,.1f} q/s")
+    else:
+        print(f"qmd subprocess:           skipped ({QMD_BIN} not found)")
+
+
+if __name__ == "__main__":
+    main()
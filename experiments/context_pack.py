@@ -0,0 +1,150 @@
+"""experiments/context_pack.py
+
+Retrieval -> generation middle stage: dedupe, rerank and pack snippets into a token budget.
+
+Usage:
+  from context_pack import pack_context
+  packed, report = pack_context(snippets, query="values", budget=1500)
+  # packed: list of snippet dicts that fit; report: token counts before/after
+
+Pipeline:
+1. Dedupe near-duplicate snippets by word-shingle Jaccard similarity (hashed shingles).
+2. Rerank with a cheap local lexical scorer (query-term coverage, blended with
+   the retriever score when present).
+3. Greedily pack best-first into the budget; the first snippet that does not fit
+   is clipped to the remaining space so the budget is used fully.
+
+Token counts are estimates (no tokenizer dependency); they are close enough for
+budgeting with OpenAI-style BPE tokenizers on English text.
+
+Standard library only.
+"""
+import hashlib
+import re
+
+DEFAULT_BUDGET = 1500
+SHINGLE_SIZE = 5
+DUP_THRESHOLD = 0.6
+MIN_CLIP_TOKENS = 32
+
+_WORD_RE = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast token-count estimate: ~4 chars per token, but at least one per word/punct."""
+    if not text:
+        return 0
+    return max(len(text) // 4, int(len(_WORD_RE.findall(text)) * 0.75)) or 1
+
+
+def shingles(text: str, n: int = SHINGLE_SIZE) -> set:
+    words = re.findall(r"\w+", text.lower())
+    if len(words) < n:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = [" ".join(words[i:i + n]) for i in range(len(words) - n + 1)]
+    return {hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest() for g in grams}
+
+
+def jaccard(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def dedupe_snippets(snippets, threshold: float = DUP_THRESHOLD):
+    """Drop snippets whose shingle set overlaps an earlier kept one by >= threshold.
+
+    Snippets contained in a longer kept snippet count as duplicates too.
+    """
+    kept, kept_sh = [], []
+    for s in snippets:
+        sh = shingles(s.get("text", ""))
+        dup = False
+        for other in kept_sh:
+            if jaccard(sh, other) >= threshold or (sh and sh <= other):
+                dup = True
+                break
+        if not dup:
+            kept.append(s)
+            kept_sh.append(sh)
+    return kept
+
+
+def score_snippet(text: str, query_terms: set, retriever_score=None) -> float:
+    """Query-term coverage with a mild length penalty, blended with retriever score."""
+    words = re.findall(r"\w+", text.lower())
+    if not words:
+        return 0.0
+    hits = sum(1 for w in words if w in query_terms)
+    coverage = len(query_terms & set(words)) / len(query_terms) if query_terms else 0.0
+    density = hits / len(words) ** 0.5
+    score = coverage + 0.1 * density
+    if retriever_score is not None:
+        score = 0.5 * score + 0.5 * float(retriever_score)
+    return score
+
+
+def rerank(snippets, query: str):
+    terms = set(re.findall(r"\w+", query.lower()))
+    scored = [(score_snippet(s.get("text", ""), terms, s.get("score")), i, s) for i, s in enumerate(snippets)]
+    # ties keep retrieval order
+    scored.sort(key=lambda x: (-x[0], x[1]))
+    return [s for _, _, s in scored]
+
+
+def clip_to_tokens(text: str, max_tokens: int) -> str:
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    # binary search on a character cut, then back off to a word boundary
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if estimate_tokens(text[:mid]) <= max_tokens - 1:
+            lo = mid
+        else:
+            hi = mid - 1
+    cut = text[:lo]
+    if " " in cut:
+        cut = cut[:cut.rfind(" ")]
+    return cut.rstrip() + "…"
+
+
+def pack(snippets, budget: int = DEFAULT_BUDGET, sep_tokens: int = 1):
+    """Greedy best-first packing; snippets must already be in priority order."""
+    out, used = [], 0
+    for s in snippets:
+        text = s.get("text", "")
+        cost = estimate_tokens(text) + sep_tokens
+        if used + cost <= budget:
+            out.append(s)
+            used += cost
+            continue
+        remaining = budget - used - sep_tokens
+        # the top snippet is always clipped in rather than returning nothing
+        if remaining >= MIN_CLIP_TOKENS or (not out and remaining > 0):
+            clipped = dict(s, text=clip_to_tokens(text, remaining), clipped=True)
+            out.append(clipped)
+            used += estimate_tokens(clipped["text"]) + sep_tokens
+        break
+    return out
+
+
+def pack_context(snippets, query: str, budget: int = DEFAULT_BUDGET, dedupe_threshold: float = DUP_THRESHOLD):
+    """Run dedupe -> rerank -> pack. Returns (packed_snippets, report)."""
+    snippets = [s if isinstance(s, dict) else {"text": s} for s in snippets]
+    tokens_in = sum(estimate_tokens(s.get("text", "")) for s in snippets)
+    unique = dedupe_snippets(snippets, dedupe_threshold)
+    ranked = rerank(unique, query)
+    packed = pack(ranked, budget)
+    tokens_out = sum(estimate_tokens(s.get("text", "")) for s in packed)
+    report = {
+        "snippets_in": len(snippets),
+        "duplicates_dropped": len(snippets) - len(unique),
+        "snippets_out": len(packed),
+        "tokens_in": tokens_in,
+        "tokens_out": tokens_out,
+        "tokens_saved": tokens_in - tokens_out,
+        "budget": budget,
+    }
+    return packed, report
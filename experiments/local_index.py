@@ -0,0 +1,431 @@
+"""experiments/local_index.py
+
+In-process vector index used as a drop-in replacement for `qmd vsearch`.
+
+Embeddings live in a single NumPy matrix on disk (`embeddings.npy`) that is
+memory-mapped on load, and document texts in an append-only `texts.bin` read
+back by byte span (`text_spans.npy`); `meta.json` only holds ids, hashes and
+the embedder, so opening an index is cheap and queries never spawn a
+subprocess. Search is a batched cosine top-k (one matrix product per batch of
+queries). For larger collections an optional IVF (inverted file) coarse
+quantizer can be built so each query only scores a few clusters: rows are
+kept sorted by cluster, so each inverted list is a contiguous slice of the
+matrix described by `ivf_offsets.npy` (CSR-style offsets).
+
+Usage:
+  from local_index import HashingEmbedder, LocalIndex
+  index = LocalIndex("~/.local/share/funstuff/vindex", HashingEmbedder())
+  index.ingest({"notes/values.md": "I value honesty ..."})
+  index.vsearch("values", k=5)   # same hit shape as qmd --json
+
+Notes:
+- Requires numpy (see experiments/requirements.txt).
+- Ingestion is incremental: documents whose content hash did not change are
+  not re-embedded.
+- The default HashingEmbedder is lexical (feature hashing of words), not
+  semantic: "car" and "automobile" do not match. Plug in a model-backed
+  embedder with `load_embedder("package.module:factory")` for semantic search.
+"""
+import hashlib
+import importlib
+import json
+import mmap
+import os
+import re
+from pathlib import Path
+
+import numpy as np
+
+EMBEDDINGS_FILE = "embeddings.npy"
+META_FILE = "meta.json"
+TEXTS_FILE = "texts.bin"
+SPANS_FILE = "text_spans.npy"
+CENTROIDS_FILE = "ivf_centroids.npy"
+OFFSETS_FILE = "ivf_offsets.npy"
+PASSAGE_WORDS = 200    # ingest_dir splits files into passages of this many words
+PASSAGE_OVERLAP = 40   # ... with this many words shared between neighbours
+KMEANS_SAMPLE = 64  # k-means trains on at most this many vectors per list
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_WORD_SPAN_RE = re.compile(r"\S+")
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class HashingEmbedder:
+    """Deterministic bag-of-words embedder (feature hashing).
+
+    No model download and stable across processes, which makes it suitable for
+    tests and for offline use. Any object with `dim` and `embed(texts)` that
+    returns an (n, dim) float32 array can be used instead; an optional `name`
+    attribute is stored with the index so switching embedders re-embeds.
+    """
+
+    name = "hashing"
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def _bucket(self, token: str):
+        h = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+        return h % self.dim, (1.0 if (h >> 63) & 1 else -1.0)
+
+    def embed(self, texts):
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for tok in _TOKEN_RE.findall(text.lower()):
+                idx, sign = self._bucket(tok)
+                out[row, idx] += sign
+        return normalize(out)
+
+
+EMBEDDERS = {"hashing": HashingEmbedder}
+
+
+def load_embedder(spec: str = "hashing"):
+    """Build an embedder from a name in EMBEDDERS or a "package.module:factory" spec."""
+    if spec in EMBEDDERS:
+        return EMBEDDERS[spec]()
+    module, sep, attr = spec.partition(":")
+    if not sep or not module or not attr:
+        raise ValueError(f"Unknown embedder {spec!r} (use one of {sorted(EMBEDDERS)} or module:factory)")
+    return getattr(importlib.import_module(module), attr)()
+
+
+def embedder_name(embedder) -> str:
+    return getattr(embedder, "name", type(embedder).__name__)
+
+
+def split_passages(text: str, size: int = PASSAGE_WORDS, overlap: int = PASSAGE_OVERLAP):
+    """Split `text` into overlapping windows of `size` words, keeping the original spacing."""
+    words = [m.span() for m in _WORD_SPAN_RE.finditer(text)]
+    step = max(1, size - overlap)
+    passages = []
+    for start in range(0, len(words), step):
+        window = words[start:start + size]
+        passages.append(text[window[0][0]:window[-1][1]])
+        if start + size >= len(words):
+            break
+    return passages
+
+
+def normalize(mat):
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (mat / norms).astype(np.float32, copy=False)
+
+
+def _topk(scores, k):
+    """Row-wise top-k indices of a (q, n) score matrix, best first."""
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64)
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.take_along_axis(scores, part, axis=1).argsort(axis=1)[:, ::-1]
+    return np.take_along_axis(part, order, axis=1)
+
+
+class TextStore:
+    """Document texts in one append-only UTF-8 file, read back by (start, end) byte spans.
+
+    New texts are appended, so an update never rewrites existing ones; the
+    file is compacted once dead bytes outgrow the live ones.
+    """
+
+    def __init__(self, path: Path, spans=None):
+        self.path = path
+        self.spans = np.zeros((0, 2), np.int64) if spans is None else spans
+        self._buf = None
+
+    def __len__(self):
+        return len(self.spans)
+
+    def __getitem__(self, row):
+        start, end = self.spans[row]
+        if self._buf is None:
+            size = self.path.stat().st_size if self.path.exists() else 0
+            if not size:
+                return ""
+            with open(self.path, "rb") as fh:
+                self._buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._buf[start:end].decode("utf-8")
+
+    def size(self):
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    def close(self):
+        if self._buf is not None:
+            self._buf.close()
+            self._buf = None
+
+    def append(self, texts):
+        """Write `texts` at the end of the file and return their (n, 2) spans."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        spans = np.zeros((len(texts), 2), np.int64)
+        with open(self.path, "ab") as fh:
+            pos = fh.tell()
+            for i, text in enumerate(texts):
+                data = text.encode("utf-8")
+                fh.write(data)
+                spans[i] = pos, pos + len(data)
+                pos += len(data)
+        self.close()
+        return spans
+
+    def compact(self):
+        """Rewrite the file with only live texts, in row order."""
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        spans = np.zeros_like(self.spans)
+        with open(tmp, "wb") as fh:
+            pos = 0
+            for i in range(len(self)):
+                data = self[i].encode("utf-8")
+                fh.write(data)
+                spans[i] = pos, pos + len(data)
+                pos += len(data)
+        self.close()
+        os.replace(tmp, self.path)
+        self.spans = spans
+
+
+class LocalIndex:
+    def __init__(self, root, embedder=None):
+        self.root = Path(os.path.expanduser(str(root)))
+        self.embedder = embedder or HashingEmbedder()
+        self.ids = []
+        self.texts = TextStore(self.root / TEXTS_FILE)
+        self.hashes = []
+        self.matrix = np.zeros((0, self.embedder.dim), dtype=np.float32)
+        self.centroids = None
+        self.offsets = None  # rows of list l are offsets[l]:offsets[l + 1]
+        self._load()
+
+    # -- storage -------------------------------------------------------------
+
+    def _load(self):
+        meta_path = self.root / META_FILE
+        emb_path = self.root / EMBEDDINGS_FILE
+        if not meta_path.exists() or not emb_path.exists():
+            return
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta.get("dim") != self.embedder.dim or meta.get("embedder", "hashing") != embedder_name(self.embedder):
+            # embedder changed; treat index as empty so everything re-embeds
+            return
+        spans_path = self.root / SPANS_FILE
+        if not spans_path.exists():
+            return
+        matrix = np.load(emb_path, mmap_mode="r")
+        spans = np.load(spans_path)
+        if not len(meta["ids"]) == len(meta["hashes"]) == len(spans) == matrix.shape[0] or (
+                len(spans) and spans[:, 1].max() > self.texts.size()):
+            # files from different saves (e.g. interrupted write); re-embed
+            return
+        self.ids = meta["ids"]
+        self.hashes = meta["hashes"]
+        self.texts.spans = spans
+        self.matrix = matrix
+        if (self.root / CENTROIDS_FILE).exists() and (self.root / OFFSETS_FILE).exists():
+            self.centroids = np.load(self.root / CENTROIDS_FILE)
+            self.offsets = np.load(self.root / OFFSETS_FILE)
+            if len(self.offsets) != len(self.centroids) + 1 or self.offsets[-1] != len(self.ids):
+                self.centroids = self.offsets = None
+
+    def _save(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / (EMBEDDINGS_FILE + ".tmp")
+        with open(tmp, "wb") as fh:
+            np.save(fh, np.ascontiguousarray(self.matrix, dtype=np.float32))
+        os.replace(tmp, self.root / EMBEDDINGS_FILE)
+        live = int((self.texts.spans[:, 1] - self.texts.spans[:, 0]).sum())
+        if self.texts.size() - live > max(live, 1 << 20):
+            self.texts.compact()
+        tmp = self.root / (SPANS_FILE + ".tmp")
+        with open(tmp, "wb") as fh:
+            np.save(fh, self.texts.spans)
+        os.replace(tmp, self.root / SPANS_FILE)
+        meta = {"dim": self.embedder.dim, "embedder": embedder_name(self.embedder),
+                "ids": self.ids, "hashes": self.hashes}
+        tmp = self.root / (META_FILE + ".tmp")
+        tmp.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.root / META_FILE)
+        self.matrix = np.load(self.root / EMBEDDINGS_FILE, mmap_mode="r")
+        if self.centroids is not None:
+            np.save(self.root / CENTROIDS_FILE, self.centroids)
+            np.save(self.root / OFFSETS_FILE, self.offsets)
+        else:
+            for name in (CENTROIDS_FILE, OFFSETS_FILE):
+                (self.root / name).unlink(missing_ok=True)
+
+    def __len__(self):
+        return len(self.ids)
+
+    # -- ingestion -----------------------------------------------------------
+
+    def ingest(self, docs: dict, prune: bool = False):
+        """Add or update documents given as {doc_id: text}.
+
+        Only new or changed documents are embedded. With prune=True, documents
+        not present in `docs` are dropped. Returns counts of what happened.
+        """
+        existing = {doc_id: i for i, doc_id in enumerate(self.ids)}
+        keep_rows, ids, hashes = [], [], []
+        to_embed = []
+        unchanged = removed = 0
+        for doc_id, i in existing.items():
+            if prune and doc_id not in docs:
+                removed += 1
+                continue
+            if doc_id in docs and content_hash(docs[doc_id]) != self.hashes[i]:
+                continue
+            keep_rows.append(i)
+            ids.append(doc_id)
+            hashes.append(self.hashes[i])
+            if doc_id in docs:
+                unchanged += 1
+        for doc_id, text in docs.items():
+            i = existing.get(doc_id)
+            if i is not None and content_hash(text) == self.hashes[i]:
+                continue
+            to_embed.append((doc_id, text))
+
+        if not to_embed and removed == 0:
+            return {"embedded": 0, "unchanged": unchanged, "removed": 0}
+
+        kept = np.asarray(self.matrix[keep_rows]) if keep_rows else np.zeros((0, self.embedder.dim), np.float32)
+        spans = self.texts.spans[keep_rows]
+        if to_embed:
+            new = self.embedder.embed([t for _, t in to_embed]).astype(np.float32, copy=False)
+            kept = np.vstack([kept, new])
+            spans = np.vstack([spans, self.texts.append([t for _, t in to_embed])])
+            for doc_id, text in to_embed:
+                ids.append(doc_id)
+                hashes.append(content_hash(text))
+        self.ids, self.hashes, self.matrix = ids, hashes, kept
+        self.texts.spans = spans
+        if self.centroids is not None:
+            # new/changed vectors join their nearest existing list; retraining
+            # the centroids is left to an explicit build_ivf()
+            assign = self._list_of_rows()[keep_rows]
+            if to_embed:
+                assign = np.concatenate([assign, self._nearest_list(new)])
+            self._sort_rows(assign)
+        self._save()
+        return {"embedded": len(to_embed), "unchanged": unchanged, "removed": removed}
+
+    def ingest_dir(self, src, patterns=("*.md", "*.txt"), prune: bool = True):
+        """Ingest text files under `src` as overlapping passages.
+
+        Each passage is its own document with id `<path relative to src>#<n>`,
+        so hits are snippet-sized like qmd's rather than whole files.
+        """
+        src = Path(src)
+        docs = {}
+        for pattern in patterns:
+            for path in sorted(src.rglob(pattern)):
+                text = path.read_text(encoding="utf-8", errors="replace")
+                for n, passage in enumerate(split_passages(text)):
+                    docs[f"{path.relative_to(src)}#{n}"] = passage
+        return self.ingest(docs, prune=prune)
+
+    # -- approximate index ---------------------------------------------------
+
+    def _nearest_list(self, vectors):
+        return (vectors @ self.centroids.T).argmax(axis=1)
+
+    def _list_of_rows(self):
+        return np.repeat(np.arange(len(self.centroids)), np.diff(self.offsets))
+
+    def _sort_rows(self, assign):
+        """Reorder rows by list id so every inverted list is a contiguous slice."""
+        order = np.argsort(assign, kind="stable")
+        self.matrix = np.asarray(self.matrix)[order]
+        self.ids = [self.ids[i] for i in order]
+        self.texts.spans = self.texts.spans[order]
+        self.hashes = [self.hashes[i] for i in order]
+        counts = np.bincount(assign, minlength=len(self.centroids))
+        self.offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+    def build_ivf(self, n_lists: int = None, iters: int = 10, seed: int = 0, save: bool = True):
+        """(Re)train spherical k-means centroids and inverted lists for `nprobe` search.
+
+        Centroids are trained on a sample of at most KMEANS_SAMPLE vectors per
+        list; every vector is then assigned to its nearest centroid once.
+        """
+        n = len(self.ids)
+        if n == 0:
+            self.centroids = self.offsets = None
+            return
+        n_lists = max(1, min(n_lists or int(np.sqrt(n)), n))
+        data = np.asarray(self.matrix)
+        rng = np.random.default_rng(seed)
+        sample = data[rng.choice(n, min(n, n_lists * KMEANS_SAMPLE), replace=False)]
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(iters):
+            assign = (sample @ centroids.T).argmax(axis=1)
+            order = np.argsort(assign, kind="stable")
+            counts = np.bincount(assign, minlength=n_lists)
+            sums = centroids.copy()
+            nonempty = np.flatnonzero(counts)
+            starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[nonempty]
+            sums[nonempty] = np.add.reduceat(sample[order], starts, axis=0)
+            centroids = normalize(sums)
+        self.centroids = centroids
+        self._sort_rows(self._nearest_list(data))
+        if save:
+            self._save()
+
+    # -- search --------------------------------------------------------------
+
+    def search_batch(self, queries, k: int = 5, nprobe: int = None):
+        """Return, per query, a list of (row, score) pairs best first.
+
+        With an IVF index and `nprobe`, only the `nprobe` closest clusters are
+        scored; otherwise every vector is scored exactly.
+        """
+        if not len(self.ids) or not queries:
+            return [[] for _ in queries]
+        q = self.embedder.embed(list(queries))
+        if nprobe and self.centroids is not None:
+            return self._search_ivf(q, k, nprobe)
+        scores = q @ np.asarray(self.matrix).T
+        top = _topk(scores, k)
+        return [[(int(r), float(scores[i, r])) for r in row] for i, row in enumerate(top)]
+
+    def _search_ivf(self, q, k, nprobe):
+        # one matrix product scores the centroids for the whole batch; then
+        # each probed list is scored once against all queries that probe it
+        probes = _topk(q @ self.centroids.T, nprobe)
+        n_q, n_probe = probes.shape
+        sizes = np.diff(self.offsets)
+        width = int(sizes[probes].max())
+        scores = np.full((n_q, n_probe, width), -np.inf, dtype=np.float32)
+        flat = probes.ravel()
+        by_list = np.argsort(flat, kind="stable")
+        bounds = np.flatnonzero(np.diff(flat[by_list])) + 1
+        for group in np.split(by_list, bounds):
+            lst = flat[group[0]]
+            start, end = self.offsets[lst], self.offsets[lst + 1]
+            if start == end:
+                continue
+            qi, pi = np.divmod(group, n_probe)
+            scores[qi, pi, : end - start] = (q[qi] @ self.matrix[start:end].T)
+        scores = scores.reshape(n_q, n_probe * width)
+        top = _topk(scores, k)
+        out = []
+        for i, row in enumerate(top):
+            slot, pos = np.divmod(row, width)
+            rows = self.offsets[probes[i, slot]] + pos
+            out.append([(int(r), float(scores[i, c])) for r, c in zip(rows, row) if scores[i, c] > -np.inf])
+        return out
+
+    def vsearch(self, query: str, k: int = 5, nprobe: int = None):
+        """Search with the same hit shape as `qmd vsearch --json`."""
+        return self.vsearch_batch([query], k, nprobe)[0]
+
+    def vsearch_batch(self, queries, k: int = 5, nprobe: int = None):
+        return [
+            [{"docid": self.ids[r], "score": s, "snippet": self.texts[r]} for r, s in hits]
+            for hits in self.search_batch(queries, k, nprobe)
+        ]
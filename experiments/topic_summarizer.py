@@ -5,8 +5,17 @@ Retrieve top-K snippets from qmd for a topic and summarize with OpenAI (gpt-5-mi
 Usage:
   python experiments/topic_summarizer.py --topic "values" --k 5 --out results.json
 
+  # in-process retrieval (no qmd subprocess); --ingest re-embeds only changed files
+  python experiments/topic_summarizer.py --backend local --ingest ~/notes --topic "values"
+  # ...with another embedder (default "hashing" is lexical, not semantic)
+  python experiments/topic_summarizer.py --backend local --embedder mypkg.embed:make_embedder --topic "values"
+
+  # retrieve more, then dedupe/rerank/pack into a prompt token budget (0 = no limit)
+  python experiments/topic_summarizer.py --topic "values" --k 20 --token-budget 1200
+
 Requirements:
-- qmd CLI available and a collection named 'user_profile' indexed (we created it earlier)
+- qmd CLI available and a collection named 'user_profile' indexed (we created it earlier),
+  or numpy for --backend local
 - OpenAI python client installed and OPENAI_API_KEY accessible to the environment
 
 This script is a small demo of local retrieval (qmd) + cloud LLM summarization.
@@ -16,18 +25,29 @@ import json
 import shlex
 import subprocess
 import os
+import sys
 from pathlib import Path
 
+from context_pack import DEFAULT_BUDGET, pack_context
+
 try:
-    from openai import OpenAI
-except Exception:
-    OpenAI = None
+    from funmetrics import configure as configure_metrics, metrics
+except ImportError:  # run as a plain script: funmetrics.py is in the repo root
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from funmetrics import configure as configure_metrics, metrics
 
 QMD_BIN = os.environ.get("QMD_BIN", "/Users/wojack/.bun/bin/qmd")
 COLLECTION = os.environ.get("QMD_COLLECTION", "user_profile")
 DEFAULT_MODEL = os.environ.get("TOPIC_SUM_MODEL", "gpt-5-mini")
+LOCAL_INDEX_DIR = os.environ.get(
+    "LOCAL_INDEX_DIR", os.path.join(os.path.expanduser("~"), ".local", "share", "funstuff", "vindex", COLLECTION)
+)
+LOCAL_EMBEDDER = os.environ.get("LOCAL_EMBEDDER", "hashing")
 
+_local_index = None
 
+
+@metrics.timed("summarizer.qmd_vsearch")
 def qmd_vsearch(query: str, k: int = 5):
     cmd = [QMD_BIN, "vsearch", query, "-c", COLLECTION, "-n", str(k), "--json"]
     proc = subprocess.run(cmd, capture_output=True, text=True)
@@ -36,8 +56,34 @@ def qmd_vsearch(query: str, k: int = 5):
     return json.loads(proc.stdout)
 
 
+def get_local_index(root: str = LOCAL_INDEX_DIR, embedder=None):
+    """Open (and cache) the local index.
+
+    `embedder` is an embedder object or a local_index.load_embedder spec; it
+    defaults to LOCAL_EMBEDDER. Passing one always reopens the index.
+    """
+    # imported lazily so the qmd path does not need numpy
+    global _local_index
+    if _local_index is None or str(_local_index.root) != os.path.expanduser(root) or embedder is not None:
+        from local_index import LocalIndex, load_embedder
+        if embedder is None or isinstance(embedder, str):
+            embedder = load_embedder(embedder or LOCAL_EMBEDDER)
+        _local_index = LocalIndex(root, embedder)
+    return _local_index
+
+
+@metrics.timed("summarizer.local_vsearch")
+def local_vsearch(query: str, k: int = 5):
+    """In-process equivalent of qmd_vsearch backed by experiments/local_index.py."""
+    return get_local_index().vsearch(query, k)
+
+
+@metrics.timed("summarizer.summarize_with_openai")
 def summarize_with_openai(snippets: list, topic: str, model: str = DEFAULT_MODEL):
-    if OpenAI is None:
+    # imported here so --help and retrieval-only runs do not load the openai client
+    try:
+        from openai import OpenAI
+    except Exception:
         raise RuntimeError("OpenAI client not available. Install openai package.")
     key = os.environ.get("OPENAI_API_KEY")
     if not key:
@@ -45,7 +91,7 @@ def summarize_with_openai(snippets: list, topic: str, model: str = DEFAULT_MODEL
 
     client = OpenAI(api_key=key)
     # Build a compact prompt
-    context = "\n\n".join([s.get("text", "") for s in snippets])
+    context = "\n\n".join([s.get("text", "") if isinstance(s, dict) else s for s in snippets])
     prompt = (
         f"You are an expert summarizer. Given the following snippets about '{topic}',\n"
         "produce: (1) a 3-bullet executive summary, and (2) a one-line TL;DR. Keep bullets short.\n\n"
@@ -64,25 +110,54 @@ def main():
     parser.add_argument("--k", type=int, default=5)
     parser.add_argument("--out", default="topic_summary.json")
     parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--backend", choices=["qmd", "local"], default="qmd")
+    parser.add_argument("--ingest", help="Directory of .md/.txt files to (re)index before searching (local backend)")
+    parser.add_argument("--embedder", default=LOCAL_EMBEDDER,
+                        help="Local backend embedder: 'hashing' (lexical) or package.module:factory")
+    parser.add_argument("--token-budget", type=int, default=DEFAULT_BUDGET,
+                        help="Max estimated prompt tokens for snippets (0 disables packing)")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="Write timings to PATH (.prom = Prometheus text, else JSON lines)")
     args = parser.parse_args()
-
-    print(f"Searching qmd for '{args.topic}' (top {args.k}) in collection {COLLECTION}...")
-    results = qmd_vsearch(args.topic, args.k)
+    configure_metrics(args.metrics)
+
+    if args.backend == "local":
+        try:
+            get_local_index(embedder=args.embedder)
+        except (ImportError, AttributeError, ValueError) as e:
+            parser.error(f"--embedder {args.embedder}: {e}")
+        if args.ingest:
+            stats = get_local_index().ingest_dir(args.ingest)
+            print(f"Indexed {args.ingest}: {stats}")
+        print(f"Searching local index for '{args.topic}' (top {args.k}) in {LOCAL_INDEX_DIR}...")
+        results = local_vsearch(args.topic, args.k)
+    else:
+        print(f"Searching qmd for '{args.topic}' (top {args.k}) in collection {COLLECTION}...")
+        results = qmd_vsearch(args.topic, args.k)
     # results is JSON list of hits; normalize
     snippets = []
     for r in results:
         txt = r.get('snippet') or r.get('text') or r.get('content') or ''
-        snippets.append({'id': r.get('docid') or r.get('id'), 'text': txt})
+        snippets.append({'id': r.get('docid') or r.get('id'), 'text': txt, 'score': r.get('score')})
+
+    context = snippets
+    pack_report = None
+    if args.token_budget > 0:
+        context, pack_report = pack_context(snippets, args.topic, budget=args.token_budget)
+        print(f"Packed {pack_report['snippets_out']}/{pack_report['snippets_in']} snippets "
+              f"({pack_report['duplicates_dropped']} duplicates): {pack_report['tokens_out']} tokens, "
+              f"saved {pack_report['tokens_saved']}")
+        metrics.incr("summarizer.tokens_saved", pack_report["tokens_saved"])
 
     summary = None
     try:
         print('Calling OpenAI to summarize...')
-        summary = summarize_with_openai([s['text'] for s in snippets], args.topic, model=args.model)
+        summary = summarize_with_openai(context, args.topic, model=args.model)
     except Exception as e:
         print('OpenAI summarization failed:', e)
         summary = None
 
-    out_obj = {'topic': args.topic, 'snippets': snippets, 'summary': summary}
+    out_obj = {'topic': args.topic, 'snippets': snippets, 'context': pack_report, 'summary': summary}
     Path(args.out).write_text(json.dumps(out_obj, indent=2))
     print('Saved output to', args.out)
 
@@ -0,0 +1,194 @@
+"""funmetrics.py — tiny timers/counters/spans shared by the CLI tools
+
+Usage:
+  from funmetrics import metrics
+
+  @metrics.timed("todo.load_todos")
+  def load_todos(...): ...
+
+  with metrics.span("bookmarks.write_html", items=len(bookmarks)):
+      ...
+  metrics.incr("todo.items_loaded", len(todos))
+
+Enable with FUNSTUFF_METRICS=<path> or a tool's `--metrics <path>` flag:
+- *.prom / *.txt -> Prometheus text exposition file, rewritten on exit
+  (point a node_exporter textfile collector or a local scraper at it)
+- anything else  -> JSON lines, one record per span/counter, appended as they happen
+
+When disabled every timer/counter is a single flag check, so instrumented
+functions keep their normal speed. No external dependencies.
+"""
+import atexit
+import functools
+import json
+import os
+import re
+import threading
+import time
+
+ENV_VAR = "FUNSTUFF_METRICS"
+PREFIX = "funstuff_"
+
+
+def _prom_name(name):
+    return PREFIX + re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+class Metrics:
+    def __init__(self):
+        self.enabled = False
+        self.path = None
+        self.format = None
+        self.timers = {}    # name -> [count, sum_s, max_s]
+        self.counters = {}  # name -> value
+        self._lock = threading.Lock()
+        self._fh = None
+        self._atexit = False
+
+    def enable(self, path, fmt=None):
+        """Start recording; fmt is "prom" or "jsonl" (default: chosen by file suffix)."""
+        self.disable()
+        self.path = path
+        self.format = fmt or ("prom" if path.endswith((".prom", ".txt")) else "jsonl")
+        self.enabled = True
+        if not self._atexit:
+            atexit.register(self.close)
+            self._atexit = True
+
+    def disable(self):
+        self.close()
+        self.enabled = False
+        self.timers.clear()
+        self.counters.clear()
+
+    # -- recording -----------------------------------------------------------
+
+    def _emit(self, record):
+        if self.format != "jsonl":
+            return
+        if self._fh is None:
+            d = os.path.dirname(self.path)
+            if d:
+                os.makedirs(d, exist_ok=True)
+            self._fh = open(self.path, "a", encoding="utf-8")
+        self._fh.write(json.dumps(record) + "\n")
+        self._fh.flush()
+
+    def observe(self, name, seconds, **attrs):
+        with self._lock:
+            t = self.timers.get(name)
+            if t is None:
+                self.timers[name] = [1, seconds, seconds]
+            else:
+                t[0] += 1
+                t[1] += seconds
+                if seconds > t[2]:
+                    t[2] = seconds
+            self._emit({"type": "span", "name": name, "ts": time.time(), "pid": os.getpid(),
+                        "duration_ms": round(seconds * 1000, 3), **attrs})
+
+    def incr(self, name, value=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+            self._emit({"type": "counter", "name": name, "ts": time.time(), "pid": os.getpid(), "value": value})
+
+    def timed(self, name):
+        """Decorator recording the wrapped function's wall time under `name`."""
+        def deco(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                t0 = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - t0)
+            return wrapper
+        return deco
+
+    def span(self, name, **attrs):
+        """Context manager timing a block; extra attrs go into the JSON line."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, attrs)
+
+    # -- export --------------------------------------------------------------
+
+    def prometheus_text(self):
+        lines = []
+        for name, (count, total, peak) in sorted(self.timers.items()):
+            m = _prom_name(name) + "_seconds"
+            lines += [
+                f"# TYPE {m} summary",
+                f"{m}_count {count}",
+                f"{m}_sum {total:.6f}",
+                f"# TYPE {m}_max gauge",
+                f"{m}_max {peak:.6f}",
+            ]
+        for name, value in sorted(self.counters.items()):
+            m = _prom_name(name) + "_total"
+            lines += [f"# TYPE {m} counter", f"{m} {value}"]
+        return "\n".join(lines) + "\n"
+
+    def flush(self):
+        if not self.enabled or self.format != "prom":
+            return
+        d = os.path.dirname(self.path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            fh.write(self.prometheus_text())
+        os.replace(tmp, self.path)
+
+    def close(self):
+        self.flush()
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+class _Span:
+    __slots__ = ("metrics", "name", "attrs", "t0")
+
+    def __init__(self, metrics, name, attrs):
+        self.metrics = metrics
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.t0, **self.attrs)
+        return False
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+metrics = Metrics()
+
+
+def configure(path=None):
+    """Enable metrics from an explicit --metrics path or the FUNSTUFF_METRICS env var."""
+    if path:
+        if not (metrics.enabled and metrics.path == path):
+            metrics.enable(path)
+    elif not metrics.enabled and os.environ.get(ENV_VAR):
+        metrics.enable(os.environ[ENV_VAR])
+    return metrics.enabled
+
+
+configure()
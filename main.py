@@ -1,15 +1,83 @@
-"""funStaff — simple starter script
+"""funStaff — simple starter script and `funstuff` command dispatcher
 
 Run: python main.py
+     python main.py <command> [args...]     (or ./run.sh <command> ...)
+
+Commands map to the subprojects' existing entry points, e.g.:
+  python main.py todo list --all
+  python main.py bookmarks --input backups/Bookmarks.json --audit
+  python main.py --help
+
+A subproject module is only imported when its command runs, so `--help` and
+light commands like `todo list` do not pay for ccxt/openai/numpy imports.
 """
 
 import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# name -> (module path relative to the repo root, help)
+COMMANDS = {
+    'todo': ('todo/__init__.py', 'CLI todo app (python -m todo)'),
+    'bookmarks': ('bookmarks_tool/tidy_bookmarks.py', 'Dedupe and reorganize Chrome bookmarks'),
+    'bookmarks-html': ('bookmarks_tool/json_to_chrome_html.py', 'Convert Chrome Bookmarks JSON to importable HTML'),
+    'grid': ('quant_demo/demo_grid.py', 'CCXT grid-strategy demo (testnet)'),
+    'summarize': ('experiments/topic_summarizer.py', 'Retrieve snippets and summarize a topic'),
+    'dot': ('web/generate_dot.py', 'Render web/dots/*.dot to plots/'),
+}
+
 
+def load_command(name):
+    """Import a command's module by path, as if its script had been run directly."""
+    rel, _ = COMMANDS[name]
+    path = os.path.join(ROOT, rel)
+    # the repo root holds the todo package and the shared funmetrics module;
+    # appended so it never shadows installed packages
+    if ROOT not in sys.path:
+        sys.path.append(ROOT)
+    if os.path.basename(path) == '__init__.py':
+        # real package: import normally so relative imports keep working
+        return __import__(os.path.basename(os.path.dirname(path)))
+    import importlib.util
+    script_dir = os.path.dirname(path)
+    if script_dir not in sys.path:
+        sys.path.insert(0, script_dir)
+    spec = importlib.util.spec_from_file_location(f'funstuff_{name.replace("-", "_")}', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
 
-def main():
-    parser = argparse.ArgumentParser(description='funStaff starter app')
+
+def run_command(name, argv):
+    module = load_command(name)
+    # the subprojects' main() functions read sys.argv themselves
+    saved = sys.argv
+    sys.argv = [f'funstuff {name}', *argv]
+    try:
+        return module.main()
+    finally:
+        sys.argv = saved
+
+
+def build_parser():
+    epilog = 'commands:\n' + '\n'.join(f'  {n:<16}{h}' for n, (_, h) in COMMANDS.items())
+    parser = argparse.ArgumentParser(
+        prog='funstuff',
+        description='funStaff starter app',
+        epilog=epilog,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
     parser.add_argument('--name', default='World', help='Name to greet')
-    args = parser.parse_args()
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in COMMANDS:
+        return run_command(argv[0], argv[1:])
+    args = build_parser().parse_args(argv)
     print(f"Hello, {args.name}! funStaff is ready.")
 
 
@@ -10,18 +10,33 @@ Notes:
 - NEVER run with live keys until you understand the code.
 """
 import os
+import sys
 import argparse
-import ccxt
 import time
-from dotenv import load_dotenv
 
-load_dotenv()
+try:
+    from funmetrics import configure as configure_metrics, metrics
+except ImportError:  # run as a plain script: funmetrics.py is in the repo root
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from funmetrics import configure as configure_metrics, metrics
 
 LIVE = os.getenv('LIVE', '0') == '1'
 API_KEY = os.getenv('TESTNET_API_KEY')
 API_SECRET = os.getenv('TESTNET_SECRET')
 
+
+def load_env():
+    # ccxt/dotenv are imported lazily so --help and simulate_grid stay cheap
+    global LIVE, API_KEY, API_SECRET
+    from dotenv import load_dotenv
+    load_dotenv()
+    LIVE = os.getenv('LIVE', '0') == '1'
+    API_KEY = os.getenv('TESTNET_API_KEY')
+    API_SECRET = os.getenv('TESTNET_SECRET')
+
+
 def make_exchange():
+    import ccxt
     # Example: MEXC (spot) - CCXT may require special flags for testnet/sandbox. Replace with your exchange of choice.
     exchange_id = 'mexc'  # change if you want another exchange
     exchange_class = getattr(ccxt, exchange_id)
@@ -36,6 +51,7 @@ def make_exchange():
     return ex
 
 
+@metrics.timed('grid.fetch_market')
 def fetch_market(exchange, symbol):
     ticker = exchange.fetch_ticker(symbol)
     book = exchange.fetch_order_book(symbol)
@@ -44,6 +60,7 @@ def fetch_market(exchange, symbol):
     return { 'ticker': ticker, 'book': book, 'mid': mid_price, 'spread': spread }
 
 
+@metrics.timed('grid.simulate_grid')
 def simulate_grid(mid, steps, step_size, amount):
     # Build symmetric grid around mid price
     buys = [mid - (i+1)*step_size for i in range(steps)]
@@ -63,8 +80,11 @@ def main():
     p.add_argument('--steps', type=int, default=5)
     p.add_argument('--step-size', type=float, default=50.0)
     p.add_argument('--amount', type=float, default=0.001)
+    p.add_argument('--metrics', metavar='PATH', help='Write timings to PATH (.prom = Prometheus text, else JSON lines)')
     args = p.parse_args()
+    configure_metrics(args.metrics)
 
+    load_env()
     ex = make_exchange()
     print('Exchange:', ex.id)
     print('LIVE mode:', LIVE)
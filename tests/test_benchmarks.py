@@ -0,0 +1,43 @@
+import json
+
+from benchmarks import Runner, compare
+from benchmarks.__main__ import main as bench_main
+from benchmarks.generators import make_chrome_bookmarks, make_price_series, make_todos
+
+
+def test_generators_shapes():
+    todos = make_todos(50)
+    assert [t["id"] for t in todos] == list(range(1, 51))
+    assert set(todos[0]) == {"id", "text", "created", "done", "done_at"}
+    data = make_chrome_bookmarks(450, folder_size=100)
+    folders = data["roots"]["bookmark_bar"]["children"] + data["roots"]["other"]["children"]
+    assert sum(len(f["children"]) for f in folders) == 450
+    assert folders[0]["children"][0]["type"] == "url"
+    assert len(make_price_series(10)) == 10
+    assert make_todos(5) == make_todos(5)
+
+
+def test_run_all_suites_and_compare(tmp_path, capsys):
+    out = tmp_path / "bench.json"
+    bench_main(["--size", "200", "--repeat", "1", "--out", str(out), "--profile", str(tmp_path / "prof")])
+    report = json.loads(out.read_text())
+    assert {"todo.load_todos", "bookmarks.pipeline", "grid.simulate_grid_per_tick"} <= set(report["results"])
+    assert (tmp_path / "prof" / "todo.save_todos.prof").exists()
+
+    rows = compare(report, report)
+    assert rows and all(ratio == 1.0 and not bad for _, _, _, ratio, bad in rows)
+
+
+def test_compare_flags_regressions():
+    baseline = {"results": {"a": {"n": 10, "best_s": 1.0}, "b": {"n": 10, "best_s": 1.0}, "c": {"n": 5, "best_s": 1.0}}}
+    current = {"results": {"a": {"n": 10, "best_s": 1.1}, "b": {"n": 10, "best_s": 1.5}, "c": {"n": 10, "best_s": 9.0}}}
+    rows = {name: bad for name, _, _, _, bad in compare(current, baseline, threshold=0.2)}
+    assert rows == {"a": False, "b": True}
+
+
+def test_runner_records_best_and_mean():
+    runner = Runner(repeat=2, quiet=True)
+    runner.bench("noop", lambda: print("discarded"), 4)
+    res = runner.results["noop"]
+    assert res["n"] == 4 and res["repeat"] == 2
+    assert res["best_s"] <= res["mean_s"]
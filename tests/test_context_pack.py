@@ -0,0 +1,54 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "experiments"))
+
+from context_pack import clip_to_tokens, dedupe_snippets, estimate_tokens, pack, pack_context, rerank
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("a") == 1
+    assert 20 <= estimate_tokens("word " * 30) <= 40
+
+
+def test_dedupe_drops_near_duplicates_and_contained():
+    base = "the quick brown fox jumps over the lazy dog near the river bank today"
+    snippets = [
+        {"text": base},
+        {"text": base + " again"},
+        {"text": "quick brown fox jumps over the lazy dog"},
+        {"text": "completely different snippet about grid trading and bitcoin prices"},
+    ]
+    kept = dedupe_snippets(snippets)
+    assert [s["text"] for s in kept] == [base, snippets[3]["text"]]
+
+
+def test_rerank_prefers_query_terms():
+    snippets = [{"text": "weather is nice"}, {"text": "my core values are honesty"}]
+    assert rerank(snippets, "values honesty")[0]["text"] == "my core values are honesty"
+
+
+def test_pack_respects_budget_and_clips_last():
+    snippets = [{"text": "alpha " * 40}, {"text": "beta " * 200}]
+    out = pack(snippets, budget=100)
+    assert len(out) == 2
+    assert out[1]["clipped"] is True
+    assert sum(estimate_tokens(s["text"]) + 1 for s in out) <= 100
+    assert clip_to_tokens("short", 10) == "short"
+
+
+def test_pack_clips_first_snippet_below_min_clip():
+    packed, report = pack_context(["word " * 100], "word", budget=30)
+    assert len(packed) == 1 and packed[0]["clipped"] is True
+    assert 0 < report["tokens_out"] <= 30
+    assert pack([{"text": "word " * 100}], budget=1) == []
+
+
+def test_pack_context_reports_savings():
+    snippets = ["values matter " * 50, "values matter " * 50, "other topic " * 300]
+    packed, report = pack_context(snippets, "values", budget=200)
+    assert report["duplicates_dropped"] == 1
+    assert report["tokens_out"] <= 200
+    assert report["tokens_saved"] == report["tokens_in"] - report["tokens_out"] > 0
+    assert packed[0]["text"].startswith("values")
@@ -0,0 +1,89 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "web"))
+
+import dot_layout
+
+EXAMPLE = Path(__file__).resolve().parent.parent / "web" / "dots" / "example.dot"
+
+
+def test_parse_example():
+    g = dot_layout.parse(EXAMPLE.read_text())
+    assert g.name == "example" and g.directed
+    assert g.attrs["rankdir"] == "LR"
+    assert list(g.nodes) == ["Start", "Process", "Decision", "End"]
+    assert g.nodes["Decision"]["shape"] == "diamond"
+    assert g.nodes["Start"]["fillcolor"] == "#f8f8f8"  # node defaults applied
+    assert ("Start", "Process", {}) in g.edges
+    assert ("Decision", "End", {"label": "yes", "color": "green"}) in g.edges
+
+
+def test_parse_comments_quotes_and_errors():
+    g = dot_layout.parse('graph "g 1" { /* c */ a -- "b c" // x\n # y\n }')
+    assert not g.directed and g.name == "g 1"
+    assert g.edges == [("a", "b c", {})]
+    with pytest.raises(dot_layout.DotSyntaxError):
+        dot_layout.parse("digraph { a -> ")
+
+
+def test_layout_layers_and_cycles():
+    g = dot_layout.parse("digraph { a -> b -> c; a -> c; c -> a; }")
+    boxes, polylines, width, height = dot_layout.layout(g)
+    # top-to-bottom: a above b above c
+    assert boxes["a"][1] < boxes["b"][1] < boxes["c"][1]
+    assert len(polylines) == 4
+    # long edge a -> c is routed through a dummy point
+    long_edge = [p for p in polylines if p[1] == "a" and p[2] == "c"][0]
+    assert len(long_edge[0]) == 3
+    # the back edge keeps its original direction
+    assert any(p[1] == "c" and p[2] == "a" for p in polylines)
+    assert width > 0 and height > 0
+
+
+def test_crossing_minimization_untangles():
+    # a1..a3 point at b3..b1 in reverse order; barycenter sweeps remove all crossings
+    g = dot_layout.parse("digraph { a1; a2; a3; b1; b2; b3; a1 -> b3; a2 -> b2; a3 -> b1; }")
+    boxes, _, _, _ = dot_layout.layout(g)
+    order_b = sorted(["b1", "b2", "b3"], key=lambda n: boxes[n][0])
+    assert order_b == ["b3", "b2", "b1"]
+
+
+def test_render_svg(tmp_path):
+    out = dot_layout.render_svg(EXAMPLE, tmp_path / "example.svg")
+    svg = Path(out).read_text()
+    assert svg.startswith("<?xml") and svg.rstrip().endswith("</svg>")
+    assert "Process Data" in svg and 'stroke="green"' in svg
+
+
+def test_subgraph_edge_target_expands_to_members():
+    g = dot_layout.parse("digraph { a -> {b c}; d -> e; }")
+    assert list(g.nodes) == ["a", "b", "c", "d", "e"]
+    assert [(s, t) for s, t, _ in g.edges] == [("a", "b"), ("a", "c"), ("d", "e")]
+    g = dot_layout.parse("digraph { x -> subgraph s { y; z } -> w }")
+    assert [(s, t) for s, t, _ in g.edges] == [("x", "y"), ("x", "z"), ("y", "w"), ("z", "w")]
+    g = dot_layout.parse("digraph { {a b} -> c; subgraph { d } -> {e f} [color=red]; { g } }")
+    assert [(s, t) for s, t, _ in g.edges] == [("a", "c"), ("b", "c"), ("d", "e"), ("d", "f")]
+    assert g.edges[-1][2]["color"] == "red"
+    assert "g" in g.nodes
+
+
+def test_non_id_edge_endpoint_is_an_error():
+    with pytest.raises(dot_layout.DotSyntaxError):
+        dot_layout.parse("digraph { a -> [color=red]; }")
+    with pytest.raises(dot_layout.DotSyntaxError):
+        dot_layout.parse("digraph { a -> { b -> c } }")
+
+
+def test_self_loop_is_drawn():
+    g = dot_layout.parse("digraph { a -> a [label=again]; a -> b }")
+    boxes, polylines, width, _ = dot_layout.layout(g)
+    loops = [p for p in polylines if p[1] == p[2] == "a"]
+    assert len(polylines) == 2 and len(loops) == 1
+    x, _, w, _ = boxes["a"]
+    assert max(px for px, _ in loops[0][0]) > x + w / 2
+    svg = "".join(dot_layout.iter_svg(g))
+    assert svg.count("<polyline") == 2 and "again" in svg
@@ -0,0 +1,84 @@
+import json
+import time
+
+import pytest
+
+import todo
+from funmetrics import Metrics, metrics
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.disable()
+    yield
+    metrics.disable()
+
+
+def test_disabled_records_nothing(tmp_path):
+    m = Metrics()
+    calls = []
+    f = m.timed("x")(lambda: calls.append(1) or 42)
+    assert f() == 42 and calls == [1]
+    with m.span("y"):
+        pass
+    m.incr("z")
+    assert m.timers == {} and m.counters == {}
+
+
+def test_jsonl_sink(tmp_path):
+    path = tmp_path / "m.jsonl"
+    m = Metrics()
+    m.enable(str(path))
+    m.timed("work")(lambda: None)()
+    with m.span("block", items=3):
+        pass
+    m.incr("things", 5)
+    m.close()
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [r["name"] for r in records] == ["work", "block", "things"]
+    assert records[1]["items"] == 3 and records[1]["duration_ms"] >= 0
+    assert records[2] == dict(records[2], type="counter", value=5)
+    assert m.timers["work"][0] == 1
+
+
+def test_prometheus_sink(tmp_path):
+    path = tmp_path / "m.prom"
+    m = Metrics()
+    m.enable(str(path))
+    f = m.timed("todo.load_todos")(lambda: None)
+    f()
+    f()
+    m.incr("todo.items_loaded", 7)
+    m.flush()
+    text = path.read_text()
+    assert "funstuff_todo_load_todos_seconds_count 2" in text
+    assert "# TYPE funstuff_todo_items_loaded_total counter" in text
+    assert "funstuff_todo_items_loaded_total 7" in text
+
+
+def test_todo_cli_metrics_flag(tmp_path):
+    db = tmp_path / "todos.json"
+    out = tmp_path / "todo.jsonl"
+    todo.main(["--file", str(db), "--metrics", str(out), "add", "Buy milk"])
+    metrics.close()
+    names = {json.loads(line)["name"] for line in out.read_text().splitlines()}
+    assert {"todo.load_todos", "todo.save_todos", "todo.items_saved"} <= names
+
+
+def test_disabled_overhead_is_negligible(tmp_path):
+    db = tmp_path / "todos.json"
+    todo.save_todos([{"id": i, "text": f"item {i}", "done": False} for i in range(1000)], path=str(db))
+
+    noop = Metrics().timed("noop")(lambda: None)
+    n = 100_000
+    t0 = time.perf_counter()
+    for _ in range(n):
+        noop()
+    per_call_wrapped = (time.perf_counter() - t0) / n
+
+    t0 = time.perf_counter()
+    for _ in range(20):
+        todo.load_todos.__wrapped__(str(db))
+    per_load = (time.perf_counter() - t0) / 20
+    # a disabled timer costs well under 1% of the operation it wraps
+    assert per_call_wrapped < 0.01 * per_load
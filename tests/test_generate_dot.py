@@ -0,0 +1,114 @@
+import os
+import stat
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "web"))
+
+import generate_dot
+
+
+@pytest.fixture
+def fake_dot(tmp_path, monkeypatch):
+    # stand-in for Graphviz: copies the source to the -o target and logs each call
+    log = tmp_path / "calls.log"
+    script = tmp_path / "dot"
+    script.write_text(f'#!/bin/sh\necho "$2" >> {log}\ncp "$2" "$4"\n')
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setattr(generate_dot, "DOT_BIN", str(script))
+    return log
+
+
+def calls(log):
+    return log.read_text().splitlines() if log.exists() else []
+
+
+def test_build_caches_unchanged_sources(tmp_path, fake_dot):
+    src = tmp_path / "dots"
+    src.mkdir()
+    a = src / "a.dot"
+    b = src / "b.dot"
+    a.write_text("digraph { x -> y }")
+    b.write_text("digraph { p -> q }")
+    out = tmp_path / "plots"
+
+    results, stats = generate_dot.build(generate_dot.find_dot_files(src), out, ("svg", "png"), jobs=4)
+    assert stats["rendered"] == 4 and stats["cache_hits"] == 0
+    assert results[str(a)]["svg"] == str(out / "a.svg")
+    assert len(calls(fake_dot)) == 4
+
+    _, stats = generate_dot.build(generate_dot.find_dot_files(src), out, ("svg", "png"))
+    assert stats["rendered"] == 0 and stats["cache_hits"] == 4
+    assert len(calls(fake_dot)) == 4
+
+    b.write_text("digraph { p -> r }")
+    _, stats = generate_dot.build(generate_dot.find_dot_files(src), out, ("svg", "png"))
+    assert stats["rendered"] == 2 and stats["cache_hits"] == 2
+
+    _, stats = generate_dot.build(generate_dot.find_dot_files(src), out, ("svg",), force=True)
+    assert stats["rendered"] == 2
+
+
+def test_missing_output_is_rerendered(tmp_path, fake_dot):
+    d = tmp_path / "g.dot"
+    d.write_text("digraph { a }")
+    generate_dot.build([d], tmp_path / "out", ("svg",))
+    (tmp_path / "out" / "g.svg").unlink()
+    _, stats = generate_dot.build([d], tmp_path / "out", ("svg",))
+    assert stats["rendered"] == 1
+
+
+def test_missing_binary_falls_back_for_svg_only(tmp_path, monkeypatch):
+    monkeypatch.setattr(generate_dot, "DOT_BIN", str(tmp_path / "missing-dot"))
+    d = tmp_path / "g.dot"
+    d.write_text("digraph { a -> b }")
+    results, stats = generate_dot.build([d], tmp_path / "out", ("svg", "png"))
+    assert results[str(d)]["svg"] == str(tmp_path / "out" / "g.svg")
+    assert results[str(d)]["png"] is None
+    assert stats["fallback"] == 1 and stats["failed"] == 1
+    assert "<svg" in (tmp_path / "out" / "g.svg").read_text()
+    # neither fallback nor failed renders are cached
+    assert generate_dot.load_cache(tmp_path / "out") == {}
+
+
+def test_same_stem_outputs_mirror_source_tree(tmp_path, fake_dot):
+    src = tmp_path / "dots"
+    for sub in ("a", "b"):
+        (src / sub).mkdir(parents=True)
+        (src / sub / "x.dot").write_text(f"digraph {{ {sub} }}")
+    out = tmp_path / "plots"
+    results, stats = generate_dot.build(generate_dot.find_dot_files(src), out, ("svg",), src=src)
+    assert stats["rendered"] == 2
+    assert (out / "a" / "x.svg").read_text() == "digraph { a }"
+    assert (out / "b" / "x.svg").read_text() == "digraph { b }"
+
+    # without a source root the flat names would collide
+    with pytest.raises(ValueError):
+        generate_dot.build(generate_dot.find_dot_files(src), out, ("svg",))
+
+
+def test_watch_rerenders_only_the_changed_file(tmp_path, fake_dot, monkeypatch):
+    src = tmp_path / "dots"
+    src.mkdir()
+    a, b = src / "a.dot", src / "b.dot"
+    a.write_text("digraph { a }")
+    b.write_text("digraph { b }")
+    out = tmp_path / "plots"
+    generate_dot.build(generate_dot.find_dot_files(src), out, ("svg",), src=src)
+    fake_dot.unlink()
+
+    polls = []
+
+    def fake_sleep(_):
+        polls.append(1)
+        if len(polls) == 1:
+            b.write_text("digraph { b -> c }")
+            os.utime(b, ns=(b.stat().st_mtime_ns + 10**9,) * 2)
+        elif len(polls) == 3:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(generate_dot.time, "sleep", fake_sleep)
+    generate_dot.watch(src, out, ("svg",))
+    assert calls(fake_dot) == [str(b)]
+    assert (out / "b.svg").read_text() == "digraph { b -> c }"
@@ -0,0 +1,184 @@
+import json
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "experiments"))
+
+from local_index import HashingEmbedder, LocalIndex, load_embedder, split_passages
+
+
+DOCS = {
+    "a.md": "I value honesty and family above everything",
+    "b.md": "Grid trading strategy on BTC with small steps",
+    "c.md": "Weekend plans: music, coffee and reading",
+}
+
+
+def test_embedder_is_deterministic():
+    e = HashingEmbedder(dim=64)
+    a = e.embed(["hello world"])
+    b = HashingEmbedder(dim=64).embed(["hello world"])
+    assert a.shape == (1, 64)
+    assert np.allclose(a, b)
+    assert np.isclose(np.linalg.norm(a[0]), 1.0)
+
+
+def test_vsearch_ranks_matching_doc_first(tmp_path):
+    index = LocalIndex(tmp_path)
+    index.ingest(DOCS)
+    hits = index.vsearch("honesty family", k=2)
+    assert len(hits) == 2
+    assert hits[0]["docid"] == "a.md"
+    assert hits[0]["snippet"] == DOCS["a.md"]
+    assert hits[0]["score"] >= hits[1]["score"]
+
+
+def test_ingest_is_incremental_and_persisted(tmp_path):
+    index = LocalIndex(tmp_path)
+    assert index.ingest(DOCS)["embedded"] == 3
+
+    reopened = LocalIndex(tmp_path)
+    assert len(reopened) == 3
+    changed = dict(DOCS, **{"b.md": "Grid trading on ETH"})
+    stats = reopened.ingest(changed)
+    assert stats == {"embedded": 1, "unchanged": 2, "removed": 0}
+    assert reopened.vsearch("ETH", k=1)[0]["docid"] == "b.md"
+
+    stats = reopened.ingest({"a.md": DOCS["a.md"]}, prune=True)
+    assert stats["removed"] == 2 and stats["embedded"] == 0
+    assert LocalIndex(tmp_path).ids == ["a.md"]
+
+
+def test_batch_and_ivf_match_exact(tmp_path):
+    index = LocalIndex(tmp_path)
+    index.ingest({f"d{i}": f"topic{i % 7} filler words {i}" for i in range(200)})
+    queries = ["topic3 filler", "topic5"]
+    exact = index.vsearch_batch(queries, k=3)
+    single = index.vsearch("topic3 filler", k=3)
+    assert [round(h["score"], 5) for h in single] == [round(h["score"], 5) for h in exact[0]]
+
+    index.build_ivf(n_lists=8)
+    full_probe = index.vsearch_batch(queries, k=3, nprobe=8)
+    for got, want in zip(full_probe, exact):
+        assert [round(h["score"], 5) for h in got] == [round(h["score"], 5) for h in want]
+    assert LocalIndex(tmp_path).centroids.shape == (8, index.embedder.dim)
+
+
+def test_empty_index_returns_no_hits(tmp_path):
+    assert LocalIndex(tmp_path).vsearch("anything") == []
+
+
+def test_ingest_assigns_to_existing_lists_without_retraining(tmp_path):
+    index = LocalIndex(tmp_path)
+    index.ingest({f"d{i}": f"topic{i % 7} filler words {i}" for i in range(100)})
+    index.build_ivf(n_lists=4)
+    centroids = index.centroids.copy()
+
+    index.ingest({"new.md": "zebra quokka"})
+    assert np.array_equal(index.centroids, centroids)
+    assert index.offsets[-1] == len(index) == 101
+    assert index.vsearch("zebra quokka", k=1, nprobe=4)[0]["docid"] == "new.md"
+
+    reopened = LocalIndex(tmp_path)
+    assert np.array_equal(reopened.offsets, index.offsets)
+    # every inverted list is a contiguous slice holding its nearest-centroid rows
+    for lst in range(4):
+        rows = reopened.matrix[reopened.offsets[lst]:reopened.offsets[lst + 1]]
+        assert (np.asarray(rows) @ reopened.centroids.T).argmax(axis=1).tolist() == [lst] * len(rows)
+
+
+def test_meta_matrix_mismatch_reads_as_empty(tmp_path):
+    LocalIndex(tmp_path).ingest(DOCS)
+    meta = json.loads((tmp_path / "meta.json").read_text())
+    meta["ids"].append("ghost.md")
+    (tmp_path / "meta.json").write_text(json.dumps(meta))
+
+    index = LocalIndex(tmp_path)
+    assert len(index) == 0
+    assert index.ingest(DOCS)["embedded"] == 3
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+class UpperEmbedder(HashingEmbedder):
+    name = "upper"
+
+
+def make_upper():
+    return UpperEmbedder()
+
+
+def test_embedder_selection_and_switch(tmp_path):
+    assert isinstance(load_embedder("hashing"), HashingEmbedder)
+    assert isinstance(load_embedder("test_local_index:make_upper"), UpperEmbedder)
+    with pytest.raises(ValueError):
+        load_embedder("nope")
+
+    LocalIndex(tmp_path).ingest(DOCS)
+    # same dim, different embedder: the stored vectors are not reused
+    switched = LocalIndex(tmp_path, load_embedder("test_local_index:make_upper"))
+    assert len(switched) == 0
+    assert switched.ingest(DOCS)["embedded"] == 3
+    assert len(LocalIndex(tmp_path, UpperEmbedder())) == 3
+
+
+def test_texts_live_outside_meta_and_compact(tmp_path):
+    index = LocalIndex(tmp_path)
+    index.ingest(DOCS)
+    meta = json.loads((tmp_path / "meta.json").read_text())
+    assert set(meta) == {"dim", "embedder", "ids", "hashes"}
+    size = (tmp_path / "texts.bin").stat().st_size
+
+    # an update appends only the changed text
+    index.ingest({"b.md": "Grid trading on ETH"})
+    assert (tmp_path / "texts.bin").stat().st_size == size + len("Grid trading on ETH")
+    reopened = LocalIndex(tmp_path)
+    assert [reopened.texts[i] for i in range(3)] == [DOCS["a.md"], DOCS["c.md"], "Grid trading on ETH"]
+
+    # dead bytes beyond the live ones (and 1 MB) trigger a rewrite
+    big = "x" * (1 << 20)
+    reopened.ingest({"big.md": big})
+    reopened.ingest({"big.md": "small"})
+    assert (tmp_path / "texts.bin").stat().st_size < 1 << 20
+    assert LocalIndex(tmp_path).vsearch("small", k=1)[0]["snippet"] == "small"
+
+
+def test_split_passages_overlap_and_keep_spacing():
+    text = " ".join(f"w{i}" for i in range(10))
+    assert split_passages(text, size=4, overlap=1) == ["w0 w1 w2 w3", "w3 w4 w5 w6", "w6 w7 w8 w9"]
+    assert split_passages("one\n\ntwo", size=4, overlap=1) == ["one\n\ntwo"]
+    assert split_passages("   ") == []
+
+
+def test_ingest_dir_indexes_passages(tmp_path):
+    src = tmp_path / "notes"
+    src.mkdir()
+    filler = " ".join(f"filler{i}" for i in range(300))
+    (src / "long.md").write_text(f"{filler} zebra quokka {filler}")
+    (src / "short.txt").write_text("honesty and family")
+
+    index = LocalIndex(tmp_path / "index")
+    stats = index.ingest_dir(src)
+    assert sorted(index.ids) == ["long.md#0", "long.md#1", "long.md#2", "long.md#3", "short.txt#0"]
+    assert stats["embedded"] == 5
+    hit = index.vsearch("zebra quokka", k=1)[0]
+    assert hit["docid"].startswith("long.md#") and "zebra quokka" in hit["snippet"]
+    assert len(hit["snippet"].split()) <= 200
+
+    # only the passages of a changed file are re-embedded
+    (src / "short.txt").write_text("honesty, family and music")
+    assert index.ingest_dir(src)["embedded"] == 1
+
+
+@pytest.mark.parametrize("spec", ["bogus", "no_such_module_xyz:make", "test_local_index:missing"])
+def test_summarizer_reports_bad_embedder(spec, tmp_path, monkeypatch, capsys):
+    import topic_summarizer
+
+    monkeypatch.setattr(topic_summarizer, "LOCAL_INDEX_DIR", str(tmp_path))
+    monkeypatch.setattr(sys, "argv", ["topic_summarizer.py", "--topic", "x", "--backend", "local", "--embedder", spec])
+    with pytest.raises(SystemExit) as exc:
+        topic_summarizer.main()
+    assert exc.value.code == 2
+    assert "--embedder" in capsys.readouterr().err
@@ -0,0 +1,56 @@
+import os
+import re
+import subprocess
+import sys
+
+from main import COMMANDS, main as app_main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, "main.py")
+
+# cold-start import budget for `funstuff todo list`, summed from -X importtime
+STARTUP_BUDGET_US = 150_000
+HEAVY_MODULES = {"ccxt", "dotenv", "openai", "numpy", "subprocess"}
+
+_IMPORT_RE = re.compile(r"import time:\s+(\d+) \|\s+\d+ \|\s*(\S+)")
+
+
+def import_profile(*args):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", MAIN, *args],
+        capture_output=True, text=True, cwd=ROOT,
+    )
+    assert proc.returncode == 0, proc.stderr
+    modules = {}
+    for line in proc.stderr.splitlines():
+        m = _IMPORT_RE.match(line)
+        if m:
+            modules[m.group(2)] = int(m.group(1))
+    return modules
+
+
+def test_todo_list_startup_budget(tmp_path):
+    modules = import_profile("todo", "--file", str(tmp_path / "todos.json"), "list")
+    assert "todo" in modules
+    assert not HEAVY_MODULES & {name.split(".")[0] for name in modules}
+    total = sum(modules.values())
+    assert total < STARTUP_BUDGET_US, f"imports took {total}us (budget {STARTUP_BUDGET_US}us)"
+
+
+def test_help_imports_no_subprojects():
+    modules = import_profile("--help")
+    roots = {name.split(".")[0] for name in modules}
+    assert not roots & ({"todo", "dot_layout", "context_pack"} | HEAVY_MODULES)
+
+
+def test_dispatch_to_todo(tmp_path, capsys):
+    db = tmp_path / "todos.json"
+    app_main(["todo", "--file", str(db), "add", "Buy", "milk"])
+    app_main(["todo", "--file", str(db), "list"])
+    out = capsys.readouterr().out
+    assert "[1] [ ] Buy milk" in out
+
+
+def test_commands_point_at_existing_files():
+    for rel, _ in COMMANDS.values():
+        assert os.path.exists(os.path.join(ROOT, rel)), rel
@@ -0,0 +1,133 @@
+import json
+import os
+
+import pytest
+
+import todo
+from todo import add_todo, load_all_lists, load_todos, main, mark_done
+from todo.shards import list_path, load_manifest
+
+
+def test_named_lists_are_separate_shards(tmp_path):
+    base = str(tmp_path / "todos.json")
+    work = list_path("work", base)
+    assert work == str(tmp_path / "lists" / "work.json")
+    assert list_path("default", base) == base
+
+    add_todo("Ship report", path=work)
+    add_todo("Buy milk", path=list_path("home", base))
+    add_todo("Default item", path=base)
+
+    assert [t["text"] for t in load_todos(work)] == ["Ship report"]
+    assert [t["text"] for t in load_todos(base)] == ["Default item"]
+    with pytest.raises(ValueError):
+        list_path("../escape", base)
+    with pytest.raises(ValueError):
+        list_path("manifest", base)
+
+
+def test_write_touches_only_its_shard_and_updates_manifest(tmp_path):
+    base = str(tmp_path / "todos.json")
+    work, home = list_path("work", base), list_path("home", base)
+    add_todo("a", path=work, list_name="work")
+    add_todo("b", path=home, list_name="home")
+    home_mtime = os.stat(home).st_mtime_ns
+
+    add_todo("c", path=work, list_name="work")
+    mark_done(1, path=work, list_name="work")
+    assert os.stat(home).st_mtime_ns == home_mtime
+
+    manifest = json.loads((tmp_path / "lists" / "manifest.json").read_text())["lists"]
+    assert manifest["work"]["count"] == 2 and manifest["work"]["done"] == 1
+    assert manifest["work"]["max_id"] == 2
+    assert manifest["home"]["count"] == 1
+
+
+def test_manifest_refreshes_stale_and_missing_entries(tmp_path):
+    base = str(tmp_path / "todos.json")
+    add_todo("a", path=list_path("work", base), list_name="work")
+    # a shard written behind the manifest's back, e.g. by a concurrent writer
+    (tmp_path / "lists" / "ops.json").write_text(json.dumps([{"id": 7, "text": "x", "done": True}]))
+    (tmp_path / "lists" / "manifest.json").unlink()
+
+    manifest = load_manifest(base)
+    assert manifest["ops"] == dict(manifest["ops"], count=1, done=1, max_id=7)
+    assert manifest["work"]["count"] == 1
+    assert (tmp_path / "lists" / "manifest.json").exists()
+
+
+def test_base_file_inside_a_lists_dir_is_not_a_shard(tmp_path):
+    # the manifest only changes when a list name is given, never by guessing from the path
+    base = tmp_path / "lists" / "todos.json"
+    main(["--file", str(base), "add", "hi"])
+    assert not (tmp_path / "lists" / "manifest.json").exists()
+
+    main(["--file", str(base), "--list", "work", "add", "there"])
+    assert os.path.exists(tmp_path / "lists" / "lists" / "work.json")
+    assert list(load_manifest(str(base))) == ["work"]
+
+
+@pytest.mark.parametrize("threshold", [None, 0])
+def test_load_all_lists_merges_in_order(tmp_path, monkeypatch, threshold):
+    if threshold is not None:
+        # force the process-pool path
+        monkeypatch.setattr(todo, "PARALLEL_MIN_BYTES", threshold)
+    base = str(tmp_path / "todos.json")
+    for name in ("zeta", "alpha"):
+        add_todo(f"{name} task", path=list_path(name, base), list_name=name)
+    add_todo("default task", path=base)
+    merged = load_all_lists(base, jobs=2)
+    assert [name for name, _ in merged] == ["default", "alpha", "zeta"]
+    assert merged[1][1][0]["text"] == "alpha task"
+
+
+def test_cli_lists_flags(tmp_path, capsys):
+    base = str(tmp_path / "todos.json")
+    main(["--file", base, "--list", "work", "add", "Fix", "bug"])
+    main(["--file", base, "--list", "home", "add", "Buy", "milk"])
+    main(["--file", base, "add", "Default", "thing"])
+    main(["--file", base, "--list", "work", "done", "1"])
+    capsys.readouterr()
+
+    main(["--file", base, "list", "--all-lists"])
+    out = capsys.readouterr().out
+    assert "[default:1] [ ] Default thing" in out
+    assert "[home:1] [ ] Buy milk" in out
+    assert "Fix bug" not in out
+
+    main(["--file", base, "search", "bug", "--all-lists"])
+    assert "[work:1] [x] Fix bug" in capsys.readouterr().out
+
+    main(["--file", base, "list"])
+    assert capsys.readouterr().out.strip() == "[1] [ ] Default thing"
+
+    main(["--file", base, "lists"])
+    out = capsys.readouterr().out
+    assert "work: 1 todos (1 done)" in out and "default: 1 todos (0 done)" in out
+
+    with pytest.raises(SystemExit):
+        main(["--file", base, "--list", "bad/name", "list"])
+
+
+def test_save_replaces_shard_atomically(tmp_path, monkeypatch):
+    base = str(tmp_path / "todos.json")
+    work = list_path("work", base)
+    add_todo("first", path=work, list_name="work")
+
+    seen = []
+    real_dump = json.dump
+
+    def dump_and_read(obj, fh, **kwargs):
+        real_dump(obj, fh, **kwargs)
+        fh.flush()
+        if fh.name.startswith(work):
+            # a reader running mid-write still gets the previous, complete list
+            seen.append([t["text"] for t in load_todos(work)])
+
+    monkeypatch.setattr(json, "dump", dump_and_read)
+    add_todo("second", path=work, list_name="work")
+    monkeypatch.undo()
+
+    assert seen == [["first"]]
+    assert [t["text"] for t in load_todos(work)] == ["first", "second"]
+    assert not [f for f in os.listdir(tmp_path / "lists") if f.endswith(".tmp")]
@@ -16,9 +16,18 @@ Usage examples:
   # search todos containing "buy"
   python todo.py search buy
 
+  # named lists: add to / list the "work" list, then query every list at once
+  python -m todo --list work add "Ship report"
+  python -m todo list --all-lists
+  python -m todo search report --all-lists
+  python -m todo lists
+
 Notes:
 - Stores data at ~/.local/share/funstuff/todos.json by default
+- Named lists are separate shards in lists/<name>.json next to it, with counts in
+  lists/manifest.json (see todo/shards.py); a write only rewrites its own shard
 - No external dependencies (only standard library)
+- `--metrics PATH` (or FUNSTUFF_METRICS) records load/save timings, see funmetrics.py
 """
 import argparse
 import json
@@ -26,6 +35,15 @@ import os
 import sys
 from datetime import datetime
 
+from funmetrics import configure as configure_metrics, metrics
+
+from .shards import DEFAULT_LIST, list_path, load_manifest, record_shard
+
+# load_all_lists parses shards in worker processes only above this many bytes:
+# json.load holds the GIL, so threads never beat a plain loop, and process
+# workers pay spawn + pickling (unpickling costs ~half of parsing)
+PARALLEL_MIN_BYTES = 16 * 1024 * 1024
+
 DEFAULT_DIR = os.path.join(os.path.expanduser("~"), ".local", "share", "funstuff")
 DEFAULT_FILE = os.path.join(DEFAULT_DIR, "todos.json")
 
@@ -39,22 +57,36 @@ def ensure_storage(path=DEFAULT_FILE):
             json.dump([], fh)
 
 
+@metrics.timed("todo.load_todos")
 def load_todos(path=DEFAULT_FILE):
     ensure_storage(path)
     with open(path, "r", encoding="utf-8") as fh:
         try:
-            return json.load(fh)
+            todos = json.load(fh)
         except Exception:
             return []
+    metrics.incr("todo.items_loaded", len(todos))
+    return todos
+
 
+@metrics.timed("todo.save_todos")
+def save_todos(todos, path=DEFAULT_FILE, list_name=None):
+    """Write `todos` to `path`; pass `list_name` when `path` is a named list's shard.
 
-def save_todos(todos, path=DEFAULT_FILE):
+    The file is replaced atomically, so a concurrent reader sees either the old
+    or the new list, never a half-written one.
+    """
     ensure_storage(path)
-    with open(path, "w", encoding="utf-8") as fh:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
         json.dump(todos, fh, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+    if list_name and list_name != DEFAULT_LIST:
+        record_shard(list_name, path, todos)
+    metrics.incr("todo.items_saved", len(todos))
 
 
-def add_todo(text, path=DEFAULT_FILE):
+def add_todo(text, path=DEFAULT_FILE, list_name=None):
     todos = load_todos(path)
     next_id = (max([t.get("id", 0) for t in todos]) + 1) if todos else 1
     item = {
@@ -65,28 +97,100 @@ def add_todo(text, path=DEFAULT_FILE):
         "done_at": None,
     }
     todos.append(item)
-    save_todos(todos, path)
+    save_todos(todos, path, list_name)
     print(f"Added [{next_id}] {text}")
 
 
+def filter_todos(todos, show_all=False, show_done=False):
+    if show_all:
+        return todos
+    if show_done:
+        return [t for t in todos if t.get("done")]
+    return [t for t in todos if not t.get("done")]
+
+
+def print_todo(t, list_name=None):
+    status = "x" if t.get("done") else " "
+    ref = f"{list_name}:{t.get('id')}" if list_name else t.get("id")
+    print(f"[{ref}] [{status}] {t.get('text')}")
+
+
 def list_todos(show_all=False, show_done=False, path=DEFAULT_FILE):
     todos = load_todos(path)
     if not todos:
         print("No todos found.")
         return
-    if show_all:
-        filtered = todos
-    elif show_done:
-        filtered = [t for t in todos if t.get("done")]
+    for t in filter_todos(todos, show_all, show_done):
+        print_todo(t)
+
+
+def list_names(base_file=DEFAULT_FILE):
+    """Default list first, then named lists from the manifest."""
+    return [DEFAULT_LIST] + sorted(load_manifest(base_file))
+
+
+@metrics.timed("todo.load_all_lists")
+def load_all_lists(base_file=DEFAULT_FILE, jobs=None):
+    """Load every list's shard. Returns [(name, todos)] in list_names order.
+
+    Shards are parsed in a process pool when there are several CPUs and the
+    shards total at least PARALLEL_MIN_BYTES; otherwise one by one.
+    """
+    names = list_names(base_file)
+    paths = [list_path(n, base_file) for n in names]
+    ensure_storage(base_file)
+    cpus = jobs or os.cpu_count() or 1
+    if cpus > 1 and len(paths) > 1 and sum(os.path.getsize(p) for p in paths) >= PARALLEL_MIN_BYTES:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(cpus, len(paths))) as pool:
+            loaded = list(pool.map(_read_shard, paths))
     else:
-        filtered = [t for t in todos if not t.get("done")]
+        loaded = [_read_shard(p) for p in paths]
+    metrics.incr("todo.items_loaded", sum(len(t) for t in loaded))
+    return list(zip(names, loaded))
+
+
+def _read_shard(path):
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except Exception:
+        return []
+
 
-    for t in filtered:
-        status = "x" if t.get("done") else " "
-        print(f"[{t.get('id')}] [{status}] {t.get('text')}")
+def list_all_lists(show_all=False, show_done=False, base_file=DEFAULT_FILE):
+    found = False
+    for name, todos in load_all_lists(base_file):
+        for t in filter_todos(todos, show_all, show_done):
+            print_todo(t, name)
+            found = True
+    if not found:
+        print("No todos found.")
 
 
-def mark_done(todo_id, path=DEFAULT_FILE):
+def search_all_lists(query, base_file=DEFAULT_FILE):
+    q = query.lower()
+    found = False
+    for name, todos in load_all_lists(base_file):
+        for t in todos:
+            if q in t.get("text", "").lower():
+                print_todo(t, name)
+                found = True
+    if not found:
+        print("No matches.")
+
+
+def show_lists(base_file=DEFAULT_FILE):
+    """Print each list with its counts; named lists come from the manifest only."""
+    default = load_todos(base_file)
+    done = sum(1 for t in default if t.get("done"))
+    print(f"{DEFAULT_LIST}: {len(default)} todos ({done} done)")
+    for name, entry in sorted(load_manifest(base_file).items()):
+        print(f"{name}: {entry['count']} todos ({entry['done']} done)")
+
+
+def mark_done(todo_id, path=DEFAULT_FILE, list_name=None):
     todos = load_todos(path)
     for t in todos:
         if t.get("id") == todo_id:
@@ -95,29 +199,30 @@ def mark_done(todo_id, path=DEFAULT_FILE):
                 return
             t["done"] = True
             t["done_at"] = datetime.utcnow().isoformat() + "Z"
-            save_todos(todos, path)
+            save_todos(todos, path, list_name)
             print(f"Marked [{todo_id}] done.")
             return
     print(f"Todo [{todo_id}] not found.")
 
 
-def remove_todo(todo_id, path=DEFAULT_FILE):
+def remove_todo(todo_id, path=DEFAULT_FILE, list_name=None):
     todos = load_todos(path)
     new = [t for t in todos if t.get("id") != todo_id]
     if len(new) == len(todos):
         print(f"Todo [{todo_id}] not found.")
         return
-    save_todos(new, path)
+    save_todos(new, path, list_name)
     print(f"Removed [{todo_id}].")
 
 
-def clear_completed(path=DEFAULT_FILE):
+def clear_completed(path=DEFAULT_FILE, list_name=None):
     todos = load_todos(path)
     new = [t for t in todos if not t.get("done")]
-    save_todos(new, path)
+    save_todos(new, path, list_name)
     print(f"Cleared completed todos. ({len(todos)-len(new)} removed)")
 
 
+@metrics.timed("todo.search_todos")
 def search_todos(query, path=DEFAULT_FILE):
     todos = load_todos(path)
     found = [t for t in todos if query.lower() in t.get("text", "").lower()]
@@ -125,8 +230,7 @@ def search_todos(query, path=DEFAULT_FILE):
         print("No matches.")
         return
     for t in found:
-        status = "x" if t.get("done") else " "
-        print(f"[{t.get('id')}] [{status}] {t.get('text')}")
+        print_todo(t)
 
 
 def build_parser():
@@ -140,6 +244,7 @@ def build_parser():
     group = p_list.add_mutually_exclusive_group()
     group.add_argument("--all", action="store_true", help="Show all todos")
     group.add_argument("--done", action="store_true", help="Show done todos")
+    p_list.add_argument("--all-lists", action="store_true", help="List across every named list")
 
     p_done = sub.add_parser("done", help="Mark todo as done")
     p_done.add_argument("id", type=int, help="Todo id")
@@ -151,8 +256,13 @@ def build_parser():
 
     p_search = sub.add_parser("search", help="Search todos")
     p_search.add_argument("query", help="Search query")
+    p_search.add_argument("--all-lists", action="store_true", help="Search every named list")
+
+    sub.add_parser("lists", help="Show lists and their counts")
 
     p.add_argument("--file", default=DEFAULT_FILE, help="Path to todos.json")
+    p.add_argument("--list", default=DEFAULT_LIST, help="Named list to use (stored in lists/<name>.json)")
+    p.add_argument("--metrics", metavar="PATH", help="Write timings to PATH (.prom = Prometheus text, else JSON lines)")
     return p
 
 
@@ -160,21 +270,33 @@ def main(argv=None):
     parser = build_parser()
     args = parser.parse_args(argv)
     cmd = args.cmd
-    path = args.file
+    base = args.file
+    try:
+        path = list_path(args.list, base)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        sys.exit(2)
+    configure_metrics(args.metrics)
 
     if cmd == "add":
         text = " ".join(args.text)
-        add_todo(text, path)
+        add_todo(text, path, args.list)
+    elif cmd == "list" and args.all_lists:
+        list_all_lists(show_all=args.all, show_done=args.done, base_file=base)
     elif cmd == "list":
         list_todos(show_all=args.all, show_done=args.done, path=path)
     elif cmd == "done":
-        mark_done(args.id, path)
+        mark_done(args.id, path, args.list)
     elif cmd == "remove":
-        remove_todo(args.id, path)
+        remove_todo(args.id, path, args.list)
     elif cmd == "clear-completed":
-        clear_completed(path)
+        clear_completed(path, args.list)
+    elif cmd == "search" and args.all_lists:
+        search_all_lists(args.query, base_file=base)
     elif cmd == "search":
         search_todos(args.query, path)
+    elif cmd == "lists":
+        show_lists(base)
     else:
         parser.print_help()
 
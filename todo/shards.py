@@ -0,0 +1,105 @@
+"""Named todo lists stored as independent shard files plus a small manifest.
+
+Layout, next to the default todos file:
+  todos.json              the default list (unchanged)
+  lists/<name>.json       one shard per named list
+  lists/manifest.json     {"lists": {name: {count, done, max_id, mtime_ns}}}
+
+Each write touches only its own shard and the manifest entry for it. The
+manifest is a cache: entries whose shard mtime no longer matches (e.g. two
+processes saved different shards at the same time) are recomputed on read.
+"""
+import json
+import os
+import re
+
+DEFAULT_LIST = "default"
+LISTS_DIR = "lists"
+MANIFEST = "manifest.json"
+
+_NAME_RE = re.compile(r"^[\w-]+$")
+
+
+def lists_dir(base_file):
+    return os.path.join(os.path.dirname(base_file) or ".", LISTS_DIR)
+
+
+def list_path(name, base_file):
+    """Path of list `name`; the default list is `base_file` itself."""
+    if not name or name == DEFAULT_LIST:
+        return base_file
+    if not _NAME_RE.match(name) or name == os.path.splitext(MANIFEST)[0]:
+        raise ValueError(f"Invalid list name: {name!r} (use letters, digits, '_' or '-')")
+    return os.path.join(lists_dir(base_file), f"{name}.json")
+
+
+def shard_name(fname):
+    """List name for a file name found in the lists dir, or None if it is not a shard."""
+    name, ext = os.path.splitext(fname)
+    if ext != ".json" or not _NAME_RE.match(name) or name == os.path.splitext(MANIFEST)[0]:
+        return None
+    return name
+
+
+def shard_stats(todos, path):
+    return {
+        "count": len(todos),
+        "done": sum(1 for t in todos if t.get("done")),
+        "max_id": max((t.get("id", 0) for t in todos), default=0),
+        "mtime_ns": os.stat(path).st_mtime_ns,
+    }
+
+
+def _read_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST), "r", encoding="utf-8") as fh:
+            return json.load(fh).get("lists", {})
+    except Exception:
+        return {}
+
+
+def _write_manifest(directory, entries):
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, MANIFEST)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump({"lists": entries}, fh, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def record_shard(name, path, todos):
+    """Update the manifest entry of list `name` after its shard at `path` was saved."""
+    directory = os.path.dirname(path)
+    entries = _read_manifest(directory)
+    entries[name] = shard_stats(todos, path)
+    _write_manifest(directory, entries)
+
+
+def load_manifest(base_file):
+    """Return {name: stats} for every shard, refreshing stale or missing entries."""
+    directory = lists_dir(base_file)
+    if not os.path.isdir(directory):
+        return {}
+    entries = _read_manifest(directory)
+    on_disk = {}
+    for fname in os.listdir(directory):
+        name = shard_name(fname)
+        if name:
+            on_disk[name] = os.path.join(directory, fname)
+    fresh = {}
+    changed = set(entries) != set(on_disk)
+    for name, path in on_disk.items():
+        entry = entries.get(name)
+        if entry and entry.get("mtime_ns") == os.stat(path).st_mtime_ns:
+            fresh[name] = entry
+            continue
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                todos = json.load(fh)
+        except Exception:
+            todos = []
+        fresh[name] = shard_stats(todos, path)
+        changed = True
+    if changed:
+        _write_manifest(directory, fresh)
+    return fresh
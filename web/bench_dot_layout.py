@@ -0,0 +1,73 @@
+"""bench_dot_layout.py - time the pure-Python renderer against Graphviz `dot`
+
+Usage:
+  python web/bench_dot_layout.py                    # 10, 100, 1000, 10000 nodes
+  python web/bench_dot_layout.py --sizes 10,500 --edges-per-node 2
+
+Graphs are random layered DAGs (seeded). The `dot` column is skipped when the
+binary is not installed; large graphs can take Graphviz a long time, so use
+--dot-max to cap the sizes sent to it.
+"""
+from pathlib import Path
+import argparse
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+
+import dot_layout
+from generate_dot import DOT_BIN
+
+
+def random_dag(n, edges_per_node=1.5, seed=0):
+    rng = random.Random(seed)
+    width = max(1, int(n ** 0.5))
+    lines = ["digraph bench {", "  node [shape=box];"]
+    for i in range(n):
+        lines.append(f'  n{i} [label="node {i}"];')
+    for i in range(width, n):
+        row_start = (i // width - 1) * width
+        for _ in range(max(1, round(rng.random() * 2 * edges_per_node))):
+            lines.append(f"  n{rng.randrange(row_start, row_start + width)} -> n{i};")
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def time_python(src: Path, out: Path):
+    t0 = time.perf_counter()
+    dot_layout.render_svg(src, out)
+    return time.perf_counter() - t0
+
+
+def time_dot(src: Path, out: Path):
+    t0 = time.perf_counter()
+    subprocess.run([DOT_BIN, "-Tsvg", str(src), "-o", str(out)], check=True)
+    return time.perf_counter() - t0
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--sizes", default="10,100,1000,10000")
+    p.add_argument("--edges-per-node", type=float, default=1.5)
+    p.add_argument("--dot-max", type=int, default=1000, help="Largest graph to render with `dot`")
+    args = p.parse_args()
+
+    has_dot = shutil.which(DOT_BIN) is not None
+    print(f"{'nodes':>7} {'edges':>7} {'python s':>10} {'dot s':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for n in (int(s) for s in args.sizes.split(",")):
+            src = tmp / f"g{n}.dot"
+            src.write_text(random_dag(n, args.edges_per_node))
+            edges = src.read_text().count("->")
+            py = time_python(src, tmp / f"g{n}.py.svg")
+            if has_dot and n <= args.dot_max:
+                dot = f"{time_dot(src, tmp / f'g{n}.dot.svg'):10.3f}"
+            else:
+                dot = f"{'skipped':>10}"
+            print(f"{n:>7} {edges:>7} {py:10.3f} {dot}")
+
+
+if __name__ == "__main__":
+    main()
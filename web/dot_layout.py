@@ -0,0 +1,531 @@
+"""dot_layout.py - pure-Python fallback renderer for simple DOT graphs
+
+Used by generate_dot.py when the Graphviz `dot` binary is not installed. It
+covers the subset of DOT our diagrams use (digraph/graph, node/edge/graph
+attribute statements, edge chains, quoted strings, comments; subgraph braces
+are flattened, and a `{a b}` edge target expands to one edge per member) and
+only emits SVG.
+
+Layout is the classic Sugiyama pipeline:
+  1. break cycles by reversing DFS back edges
+  2. assign layers by longest path from the sources
+  3. split long edges with dummy nodes
+  4. reduce crossings with alternating barycenter sweeps
+  5. place nodes left to right within each layer
+Self-loops take no part in the layout and are drawn as a small loop on the
+right of their node.
+
+Usage:
+  from dot_layout import render_svg
+  render_svg(Path("web/dots/example.dot"), Path("plots/example.svg"))
+"""
+from collections import defaultdict, deque
+from html import escape
+from pathlib import Path
+import re
+
+NODE_HEIGHT = 36
+CHAR_WIDTH = 7
+NODE_GAP = 24
+RANK_GAP = 60
+MARGIN = 20
+SWEEPS = 8
+LOOP_SIZE = 18
+
+_TOKEN_RE = re.compile(
+    r'''\s+|//[^\n]*|\#[^\n]*|/\*.*?\*/      # whitespace and comments
+      |(?P<str>"(?:[^"\\]|\\.)*")
+      |(?P<html><[^<>]*>)
+      |(?P<edge>->|--)
+      |(?P<id>[A-Za-z_\u0080-\uffff][\w.\u0080-\uffff]*|-?(?:\d+\.?\d*|\.\d+))
+      |(?P<punct>[{}\[\];,=:])''',
+    re.S | re.X,
+)
+
+class DotSyntaxError(ValueError):
+    pass
+
+
+class Graph:
+    def __init__(self, name="", directed=True):
+        self.name = name
+        self.directed = directed
+        self.attrs = {}
+        self.nodes = {}  # name -> attrs (insertion ordered)
+        self.edges = []  # (src, dst, attrs)
+
+    def add_node(self, name, attrs=None):
+        node = self.nodes.setdefault(name, {})
+        if attrs:
+            node.update(attrs)
+        return node
+
+
+def tokenize(text):
+    tokens = []
+    pos = 0
+    while pos < len(text):
+        m = _TOKEN_RE.match(text, pos)
+        if not m:
+            raise DotSyntaxError(f"unexpected character {text[pos]!r} at offset {pos}")
+        pos = m.end()
+        kind = m.lastgroup
+        if kind is None:
+            continue
+        value = m.group(kind)
+        if kind == "str":
+            value = value[1:-1].replace('\\"', '"')
+            kind = "id"
+        elif kind == "html":
+            value = value[1:-1]
+            kind = "id"
+        tokens.append((kind, value))
+    return tokens
+
+
+def parse(text):
+    """Parse DOT source into a Graph."""
+    toks = tokenize(text)
+    i = 0
+
+    def peek(offset=0):
+        return toks[i + offset] if i + offset < len(toks) else (None, None)
+
+    def take(expected=None):
+        nonlocal i
+        tok = peek()
+        if tok[0] is None or (expected and tok[1] != expected):
+            raise DotSyntaxError(f"expected {expected or 'token'}, got {tok[1]!r}")
+        i += 1
+        return tok
+
+    def attr_list():
+        attrs = {}
+        while peek()[1] == "[":
+            take("[")
+            while peek()[1] != "]":
+                key = take()[1]
+                value = "true"
+                if peek()[1] == "=":
+                    take("=")
+                    value = take()[1]
+                attrs[key] = value
+                if peek()[1] in (",", ";"):
+                    take()
+            take("]")
+        return attrs
+
+    def endpoint():
+        """Node names of one edge endpoint: an id or a `{a b ...}` block."""
+        if peek()[1] == "subgraph":
+            take()
+            if peek()[1] != "{":
+                take()
+        if peek()[1] == "{":
+            take("{")
+            members = []
+            while peek()[1] != "}":
+                kind_, value = take()
+                if value in (";", ","):
+                    continue
+                if kind_ != "id":
+                    raise DotSyntaxError(f"unsupported token {value!r} in edge endpoint block")
+                members.append(value)
+            take("}")
+            return members
+        kind_, value = take()
+        if kind_ != "id":
+            raise DotSyntaxError(f"expected node id after edge operator, got {value!r}")
+        if peek()[1] == ":":  # ports are ignored
+            take()
+            take()
+        return [value]
+
+    def block_starts_edge():
+        """True if the `{...}` / `subgraph` block at the cursor is followed by an edge op."""
+        j = i + 1 if peek()[1] == "subgraph" else i
+        if j < len(toks) and toks[j][1] != "{":
+            j += 1  # subgraph name
+        level = 0
+        while j < len(toks):
+            if toks[j][1] == "{":
+                level += 1
+            elif toks[j][1] == "}":
+                level -= 1
+                if level == 0:
+                    return j + 1 < len(toks) and toks[j + 1][0] == "edge"
+            j += 1
+        return False
+
+    if peek()[1] == "strict":
+        take()
+    kind = take()[1]
+    if kind not in ("graph", "digraph"):
+        raise DotSyntaxError("graph must start with 'graph' or 'digraph'")
+    g = Graph(directed=kind == "digraph")
+    if peek()[1] != "{":
+        g.name = take()[1]
+    take("{")
+    node_defaults, edge_defaults = {}, {}
+
+    def parse_statement():
+        """A node statement or an edge chain whose members are ids or `{...}` blocks."""
+        chain = [endpoint()]
+        while peek()[0] == "edge":
+            take()
+            chain.append(endpoint())
+        attrs = attr_list()
+        if len(chain) == 1:
+            node = g.add_node(chain[0][0])
+            for k, v in node_defaults.items():
+                node.setdefault(k, v)
+            node.update(attrs)
+            return
+        for group in chain:
+            for name in group:
+                if name not in g.nodes:
+                    g.add_node(name, dict(node_defaults))
+        eattrs = dict(edge_defaults, **attrs)
+        for sources, targets in zip(chain, chain[1:]):
+            for a in sources:
+                for b in targets:
+                    g.edges.append((a, b, eattrs))
+
+    depth = 1
+    while depth:
+        kind_, value = peek()
+        if kind_ is None:
+            raise DotSyntaxError("unbalanced braces")
+        if value in (";", ","):
+            take()
+        elif value == "}":
+            take()
+            depth -= 1
+        elif value in ("{", "subgraph") and block_starts_edge():
+            parse_statement()
+        elif value == "{":
+            take()
+            depth += 1
+        elif value == "subgraph":
+            take()
+            if peek()[1] != "{":
+                take()
+        elif value in ("graph", "node", "edge") and peek(1)[1] == "[":
+            take()
+            attrs = attr_list()
+            {"graph": g.attrs, "node": node_defaults, "edge": edge_defaults}[value].update(attrs)
+        elif kind_ == "id" and peek(1)[1] == "=":
+            key = take()[1]
+            take("=")
+            g.attrs[key] = take()[1]
+        elif kind_ == "id":
+            parse_statement()
+        else:
+            raise DotSyntaxError(f"unexpected token {value!r}")
+    return g
+
+
+# -- layout ------------------------------------------------------------------
+
+
+def _acyclic_edges(nodes, edges):
+    """Return edges as (src, dst, reversed, attrs) with DFS back edges flipped.
+
+    Self-loops are left out here; layout() draws them separately.
+    """
+    out = defaultdict(list)
+    for idx, (a, b, _) in enumerate(edges):
+        out[a].append((b, idx))
+    state = {}  # 1 = on stack, 2 = done
+    back = set()
+    for root in nodes:
+        if root in state:
+            continue
+        state[root] = 1
+        stack = [(root, iter(out[root]))]
+        while stack:
+            node, it = stack[-1]
+            for nxt, idx in it:
+                s = state.get(nxt)
+                if s == 1:
+                    back.add(idx)
+                elif s is None:
+                    state[nxt] = 1
+                    stack.append((nxt, iter(out[nxt])))
+                    break
+            else:
+                state[node] = 2
+                stack.pop()
+    result = []
+    for idx, (a, b, attrs) in enumerate(edges):
+        if a == b:
+            continue
+        result.append((b, a, True, attrs) if idx in back else (a, b, False, attrs))
+    return result
+
+
+def _assign_layers(nodes, edges):
+    indeg = {n: 0 for n in nodes}
+    succ = defaultdict(list)
+    for a, b, _, _ in edges:
+        succ[a].append(b)
+        indeg[b] += 1
+    layer = {n: 0 for n in nodes}
+    queue = deque(n for n in nodes if indeg[n] == 0)
+    while queue:
+        n = queue.popleft()
+        for m in succ[n]:
+            layer[m] = max(layer[m], layer[n] + 1)
+            indeg[m] -= 1
+            if indeg[m] == 0:
+                queue.append(m)
+    return layer
+
+
+def _barycenter_sweep(layers, neighbors):
+    """Reorder each layer by the mean position of its neighbors in the fixed layer."""
+    for idx in range(1, len(layers)):
+        pos = {n: i for i, n in enumerate(layers[idx - 1])}
+        _reorder(layers, idx, neighbors, pos)
+
+
+def _reorder(layers, idx, neighbors, pos):
+    keyed = []
+    for i, n in enumerate(layers[idx]):
+        ps = [pos[m] for m in neighbors[n] if m in pos]
+        keyed.append((sum(ps) / len(ps) if ps else i, i, n))
+    keyed.sort()
+    layers[idx] = [n for _, _, n in keyed]
+
+
+def _count_crossings(layers, down):
+    """Count crossings between adjacent layers (O(E log V) per layer pair via BIT)."""
+    total = 0
+    for idx in range(len(layers) - 1):
+        pos_next = {n: i for i, n in enumerate(layers[idx + 1])}
+        pairs = sorted((i, pos_next[m]) for i, n in enumerate(layers[idx]) for m in down[n] if m in pos_next)
+        size = len(layers[idx + 1])
+        tree = [0] * (size + 1)
+        seen = 0
+        for _, p in pairs:
+            greater = seen
+            k = p + 1
+            while k > 0:
+                greater -= tree[k]
+                k -= k & -k
+            total += greater
+            k = p + 1
+            while k <= size:
+                tree[k] += 1
+                k += k & -k
+            seen += 1
+    return total
+
+
+def layout(g: Graph, sweeps: int = SWEEPS):
+    """Compute positions. Returns (node boxes, edge polylines, width, height).
+
+    Boxes map node name -> (cx, cy, w, h); polylines are (points, src, dst,
+    attrs) with points running from source to target in the original edge
+    direction.
+    """
+    names = list(g.nodes)
+    edges = _acyclic_edges(names, g.edges)
+    layer = _assign_layers(names, edges)
+
+    # split long edges with dummy nodes
+    down, up = defaultdict(list), defaultdict(list)
+    chains = []
+    for n, (a, b, rev, _) in enumerate(edges):
+        path = [a]
+        for step in range(layer[a] + 1, layer[b]):
+            dummy = ("dummy", n, step)
+            layer[dummy] = step
+            path.append(dummy)
+        path.append(b)
+        for u, v in zip(path, path[1:]):
+            down[u].append(v)
+            up[v].append(u)
+        chains.append(path[::-1] if rev else path)
+
+    n_layers = max(layer.values(), default=-1) + 1
+    layers = [[] for _ in range(n_layers)]
+    for n in names:
+        layers[layer[n]].append(n)
+    for path in chains:
+        for d in path:
+            if isinstance(d, tuple):
+                layers[layer[d]].append(d)
+
+    # keep the best ordering seen across alternating down/up sweeps
+    best = [list(l) for l in layers]
+    best_cross = _count_crossings(layers, down)
+    for sweep in range(sweeps):
+        if best_cross == 0:
+            break
+        if sweep % 2 == 0:
+            _barycenter_sweep(layers, up)
+        else:
+            rev = layers[::-1]
+            _barycenter_sweep(rev, down)
+            layers = rev[::-1]
+        cross = _count_crossings(layers, down)
+        if cross < best_cross:
+            best, best_cross = [list(l) for l in layers], cross
+    layers = best
+
+    # coordinates in a top-to-bottom frame; rotated for rankdir=LR
+    lr = g.attrs.get("rankdir", "TB").upper() in ("LR", "RL")
+    sizes = {}
+    for n in names:
+        attrs = g.nodes[n]
+        label = attrs.get("label", n)
+        lines = label.replace("\\n", "\n").split("\n")
+        w = max(54, CHAR_WIDTH * max(len(s) for s in lines) + 20)
+        h = NODE_HEIGHT + 14 * (len(lines) - 1)
+        shape = attrs.get("shape")
+        if shape == "diamond":
+            w, h = w * 1.4, h * 1.4
+        elif shape in ("circle", "doublecircle"):
+            w = h = max(w, h)
+        sizes[n] = (w, h)
+
+    boxes = {}
+    rank_pos = 0.0
+    breadth = 0.0
+    for row in layers:
+        along = [(sizes[n][1] if lr else sizes[n][0]) if n in sizes else 0 for n in row]
+        depth = max([(sizes[n][0] if lr else sizes[n][1]) for n in row if n in sizes] or [0])
+        offset = 0.0
+        for n, extent in zip(row, along):
+            c_along = offset + extent / 2
+            c_rank = rank_pos + depth / 2
+            w, h = sizes.get(n, (0, 0))
+            boxes[n] = (c_rank, c_along, w, h) if lr else (c_along, c_rank, w, h)
+            offset += extent + NODE_GAP
+        breadth = max(breadth, offset - NODE_GAP)
+        rank_pos += depth + RANK_GAP
+    # center each layer within the widest one
+    for row in layers:
+        if not row:
+            continue
+        first, last = boxes[row[0]], boxes[row[-1]]
+        if lr:
+            span = (last[1] + last[3] / 2) - (first[1] - first[3] / 2)
+            shift = (breadth - span) / 2
+            for n in row:
+                x, y, w, h = boxes[n]
+                boxes[n] = (x, y + shift, w, h)
+        else:
+            span = (last[0] + last[2] / 2) - (first[0] - first[2] / 2)
+            shift = (breadth - span) / 2
+            for n in row:
+                x, y, w, h = boxes[n]
+                boxes[n] = (x + shift, y, w, h)
+
+    polylines = []
+    for path, (_, _, rev, eattrs) in zip(chains, edges):
+        points = [(boxes[p][0], boxes[p][1]) for p in path]
+        if rev and len(points) == 2:
+            # bend short back edges so they do not sit on top of the forward edge
+            (x1, y1), (x2, y2) = points
+            bend = NODE_HEIGHT
+            points.insert(1, ((x1 + x2) / 2, max(y1, y2) + bend) if lr else (max(x1, x2) + bend, (y1 + y2) / 2))
+        polylines.append((points, path[0], path[-1], eattrs))
+    loops = [(a, attrs) for a, b, attrs in g.edges if a == b]
+    for a, eattrs in loops:
+        # center -> two points right of the node -> center; iter_svg clips both ends to the box
+        x, y, w, h = boxes[a]
+        right = x + w / 2 + LOOP_SIZE
+        polylines.append(([(x, y), (right, y - h / 2), (right, y + h / 2), (x, y)], a, a, eattrs))
+    if any(rev for _, _, rev, _ in edges):
+        breadth += NODE_HEIGHT / 2
+    rank_extent = rank_pos - RANK_GAP if layers else 0
+    width, height = (rank_extent, breadth) if lr else (breadth, rank_extent)
+    if loops:
+        width += LOOP_SIZE
+    node_boxes = {n: boxes[n] for n in names}
+    return node_boxes, polylines, width + 2 * MARGIN, height + 2 * MARGIN
+
+
+# -- SVG output --------------------------------------------------------------
+
+
+def _clip_to_box(p, q, box):
+    """Move point p (a node center) toward q until it leaves the node box."""
+    cx, cy, w, h = box
+    dx, dy = q[0] - cx, q[1] - cy
+    if dx == 0 and dy == 0:
+        return p
+    scale = min(w / 2 / abs(dx) if dx else float("inf"), h / 2 / abs(dy) if dy else float("inf"))
+    return (cx + dx * scale, cy + dy * scale)
+
+
+def _shape_svg(shape, x, y, w, h, style):
+    if shape in ("box", "rect", "rectangle", "square"):
+        return f'<rect x="{x - w / 2:.1f}" y="{y - h / 2:.1f}" width="{w:.1f}" height="{h:.1f}" {style}/>'
+    if shape == "diamond":
+        pts = f"{x:.1f},{y - h / 2:.1f} {x + w / 2:.1f},{y:.1f} {x:.1f},{y + h / 2:.1f} {x - w / 2:.1f},{y:.1f}"
+        return f'<polygon points="{pts}" {style}/>'
+    if shape in ("circle", "doublecircle"):
+        r = max(w, h) / 2
+        out = f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{r:.1f}" {style}/>'
+        if shape == "doublecircle":
+            out += f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{r - 4:.1f}" fill="none" stroke="black"/>'
+        return out
+    return f'<ellipse cx="{x:.1f}" cy="{y:.1f}" rx="{w / 2:.1f}" ry="{h / 2:.1f}" {style}/>'
+
+
+def _text_svg(x, y, label, size=14):
+    lines = label.replace("\\n", "\n").split("\n")
+    top = y - (len(lines) - 1) * 7
+    return "".join(
+        f'<text x="{x:.1f}" y="{top + i * 14 + 4:.1f}" text-anchor="middle" '
+        f'font-family="Times,serif" font-size="{size}">{escape(s)}</text>'
+        for i, s in enumerate(lines)
+    )
+
+
+def iter_svg(g: Graph):
+    """Yield SVG fragments for a laid-out graph, so large graphs stream to disk."""
+    boxes, polylines, width, height = layout(g)
+    yield ('<?xml version="1.0" encoding="UTF-8" standalone="no"?>\n'
+           f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}pt" height="{height:.0f}pt" '
+           f'viewBox="0 0 {width:.1f} {height:.1f}">\n'
+           '<defs><marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="8" '
+           'markerHeight="8" orient="auto-start-reverse"><path d="M0,0 L10,5 L0,10 z" fill="context-stroke"/>'
+           '</marker></defs>\n'
+           f'<g transform="translate({MARGIN},{MARGIN})">\n')
+    if g.name:
+        yield f"<title>{escape(g.name)}</title>\n"
+    for points, src, dst, attrs in polylines:
+        points = list(points)
+        points[0] = _clip_to_box(points[0], points[1], boxes[src])
+        points[-1] = _clip_to_box(points[-1], points[-2], boxes[dst])
+        color = escape(attrs.get("color", "black"), quote=True)
+        marker = ' marker-end="url(#arrow)"' if g.directed else ""
+        pts = " ".join(f"{x:.1f},{y:.1f}" for x, y in points)
+        yield f'<polyline points="{pts}" fill="none" stroke="{color}"{marker}/>\n'
+        if "label" in attrs:
+            mid = points[len(points) // 2 - 1] if len(points) > 2 else points[0]
+            end = points[len(points) // 2]
+            yield _text_svg((mid[0] + end[0]) / 2, (mid[1] + end[1]) / 2 - 6, attrs["label"], 12) + "\n"
+    for name, (x, y, w, h) in boxes.items():
+        attrs = g.nodes[name]
+        filled = "filled" in attrs.get("style", "")
+        fill = attrs.get("fillcolor", attrs.get("color", "lightgrey")) if filled else "none"
+        stroke = attrs.get("color", "black")
+        style = f'fill="{escape(fill, quote=True)}" stroke="{escape(stroke, quote=True)}"'
+        yield (f'<g><title>{escape(name)}</title>'
+               + _shape_svg(attrs.get("shape", "ellipse"), x, y, w, h, style)
+               + _text_svg(x, y, attrs.get("label", name)) + "</g>\n")
+    yield "</g>\n</svg>\n"
+
+
+def render_svg(dot_path: Path, out_file: Path):
+    """Parse `dot_path` and stream an SVG rendering to `out_file`."""
+    g = parse(Path(dot_path).read_text(encoding="utf-8"))
+    with open(out_file, "w", encoding="utf-8") as fh:
+        for chunk in iter_svg(g):
+            fh.write(chunk)
+    return str(out_file)
@@ -1,20 +1,79 @@
 """generate_dot.py - render .dot files to plots/ (SVG/PNG)
+
+Usage:
+  python web/generate_dot.py --src web/dots --out plots --format svg,png
+  python web/generate_dot.py --jobs 8          # render changed graphs in parallel
+  python web/generate_dot.py --watch           # re-render a file when it changes
+  python web/generate_dot.py --force           # ignore the build cache
+
+Outputs mirror the source tree: web/dots/a/x.dot -> plots/a/x.svg.
+Renders are cached in <out>/.dot_cache.json keyed on the source content hash and
+format, so unchanged graphs are skipped on the next run. Set DOT_BIN to use a
+specific Graphviz `dot` executable. When `dot` is not installed, SVG output falls
+back to the pure-Python renderer in dot_layout.py (other formats are skipped).
 """
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import argparse
+import hashlib
+import json
+import os
 import subprocess
 import sys
+import time
+
+import dot_layout
+
+DOT_BIN = os.environ.get("DOT_BIN", "dot")
+CACHE_FILE = ".dot_cache.json"
+
+
+def source_hash(dot_path: Path) -> str:
+    return hashlib.sha256(dot_path.read_bytes()).hexdigest()
+
+
+def load_cache(out_dir: Path) -> dict:
+    try:
+        return json.loads((out_dir / CACHE_FILE).read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+
+
+def save_cache(out_dir: Path, cache: dict):
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tmp = out_dir / (CACHE_FILE + ".tmp")
+    tmp.write_text(json.dumps(cache, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, out_dir / CACHE_FILE)
+
+
+def render_one(dot_path: Path, out_file: Path, fmt: str):
+    """Render one file/format. Returns (output path or None, seconds, renderer).
+
+    renderer is "dot", "python" (fallback for a missing binary) or None on failure.
+    """
+    t0 = time.perf_counter()
+    try:
+        subprocess.run([DOT_BIN, f"-T{fmt}", str(dot_path), "-o", str(out_file)], check=True)
+        return str(out_file), time.perf_counter() - t0, "dot"
+    except FileNotFoundError:
+        if fmt != "svg":
+            return None, time.perf_counter() - t0, None
+        try:
+            out = dot_layout.render_svg(dot_path, out_file)
+            return out, time.perf_counter() - t0, "python"
+        except Exception as e:
+            print(f"fallback render failed for {dot_path}: {e}", file=sys.stderr)
+    except Exception:
+        pass
+    return None, time.perf_counter() - t0, None
+
 
 def render_dot(dot_path: Path, out_dir: Path, formats=("svg",)):
     out_dir.mkdir(parents=True, exist_ok=True)
     basename = dot_path.stem
     results = {}
     for fmt in formats:
-        out_file = out_dir / f"{basename}.{fmt}"
-        try:
-            subprocess.run(["dot", f"-T{fmt}", str(dot_path), "-o", str(out_file)], check=True)
-            results[fmt] = str(out_file)
-        except Exception:
-            results[fmt] = None
+        results[fmt], _, _ = render_one(dot_path, out_dir / f"{basename}.{fmt}", fmt)
     return results
 
 
@@ -22,20 +81,139 @@ def find_dot_files(src_dir: Path):
     return sorted(src_dir.glob("**/*.dot"))
 
 
-def main():
-    src = Path('web/dots')
-    out = Path('plots')
-    formats=("svg","png")
+def output_paths(dots, out_dir: Path, src: Path = None):
+    """Map each dot to its output path without the format suffix.
+
+    With `src`, outputs mirror the path relative to it; otherwise they are
+    named by file stem and duplicate stems raise ValueError.
+    """
+    outs = {d: out_dir / (d.relative_to(src) if src else Path(d.name)).with_suffix("") for d in dots}
+    seen = {}
+    for d, out in outs.items():
+        if out in seen:
+            raise ValueError(f"{d} and {seen[out]} would both render to {out}.*")
+        seen[out] = d
+    return outs
+
+
+def build(dots, out_dir: Path, formats=("svg",), jobs=None, force=False, src: Path = None):
+    """Render every (dot, format) whose source hash changed since the last build.
+
+    Outputs go to out_dir, mirroring each dot's path relative to `src` (see
+    output_paths). Returns (results, stats) where results maps dot path ->
+    {fmt: output or None} and stats holds cache hits, renders, failures and timings.
+    """
+    t0 = time.perf_counter()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    outs = output_paths(dots, out_dir, src)
+    cache = {} if force else load_cache(out_dir)
+    results = {str(d): {} for d in dots}
+    todo = []
+    hits = 0
+    for d in dots:
+        digest = source_hash(d)
+        outs[d].parent.mkdir(parents=True, exist_ok=True)
+        for fmt in formats:
+            key = f"{d}:{fmt}"
+            out_file = outs[d].with_name(f"{outs[d].name}.{fmt}")
+            entry = cache.get(key)
+            if entry and entry.get("hash") == digest and out_file.exists():
+                results[str(d)][fmt] = str(out_file)
+                hits += 1
+            else:
+                todo.append((d, fmt, out_file, digest))
+
+    render_times = {}
+    failures = fallbacks = 0
+    if todo:
+        with ThreadPoolExecutor(max_workers=jobs or min(32, (os.cpu_count() or 1) + 4)) as pool:
+            outcomes = pool.map(lambda job: render_one(job[0], job[2], job[1]), todo)
+            for (d, fmt, _, digest), (out, secs, renderer) in zip(todo, outcomes):
+                results[str(d)][fmt] = out
+                render_times[f"{outs[d].relative_to(out_dir)}.{fmt}"] = round(secs, 4)
+                if out is None:
+                    failures += 1
+                    cache.pop(f"{d}:{fmt}", None)
+                elif renderer == "python":
+                    # not cached, so a real Graphviz render replaces it once installed
+                    fallbacks += 1
+                    cache.pop(f"{d}:{fmt}", None)
+                else:
+                    cache[f"{d}:{fmt}"] = {"hash": digest, "output": out}
+        save_cache(out_dir, cache)
+
+    stats = {
+        "cache_hits": hits,
+        "rendered": len(todo) - failures,
+        "failed": failures,
+        "fallback": fallbacks,
+        "render_times": render_times,
+        "total_seconds": round(time.perf_counter() - t0, 4),
+    }
+    return results, stats
+
+
+def print_stats(stats):
+    print(f"cache hits: {stats['cache_hits']}, rendered: {stats['rendered']}, "
+          f"failed: {stats['failed']}, python fallback: {stats['fallback']}, total: {stats['total_seconds']:.2f}s")
+    slowest = sorted(stats["render_times"].items(), key=lambda kv: -kv[1])[:5]
+    for name, secs in slowest:
+        print(f"  {name}: {secs:.3f}s")
+
+
+def snapshot(src: Path):
+    return {d: d.stat().st_mtime_ns for d in find_dot_files(src)}
+
+
+def watch(src: Path, out: Path, formats, jobs=None, interval=0.5):
+    """Poll `src` and re-render only the .dot files whose mtime changed."""
+    print(f"watching {src} (Ctrl-C to stop)")
+    seen = snapshot(src)
+    try:
+        while True:
+            time.sleep(interval)
+            current = snapshot(src)
+            changed = [d for d, m in current.items() if seen.get(d) != m]
+            seen = current
+            if changed:
+                results, stats = build(changed, out, formats, jobs, src=src)
+                for d, res in results.items():
+                    print(Path(d).name, res)
+                print_stats(stats)
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Render .dot files with Graphviz")
+    p.add_argument("--src", default="web/dots")
+    p.add_argument("--out", default="plots")
+    p.add_argument("--format", default="svg,png", help="Comma-separated output formats")
+    p.add_argument("--jobs", type=int, default=None, help="Parallel renders (default: CPU count + 4)")
+    p.add_argument("--force", action="store_true", help="Ignore the build cache")
+    p.add_argument("--watch", action="store_true", help="Keep running and re-render changed files")
+    args = p.parse_args(argv)
+
+    src = Path(args.src)
+    out = Path(args.out)
+    formats = tuple(f.strip() for f in args.format.split(",") if f.strip())
     if not src.exists():
         print('no src dir', src)
         sys.exit(2)
     dots = find_dot_files(src)
-    if not dots:
+    if not dots and not args.watch:
         print('no .dot files')
         return
-    for d in dots:
-        res=render_dot(d,out,formats)
-        print(d.name, res)
+    try:
+        results, stats = build(dots, out, formats, args.jobs, args.force, src=src)
+    except ValueError as e:
+        print(e)
+        sys.exit(2)
+    for d, res in results.items():
+        print(Path(d).name, res)
+    print_stats(stats)
+    if args.watch:
+        watch(src, out, formats, args.jobs)
 
 if __name__=='__main__':
     main()